@@ -34,7 +34,11 @@ from .command_parser import VGLiteCommandParser
 from .register_analyzer import GPURegisterAnalyzer
 from .output import (
     create_command_table,
+    create_command_table_bulk,
     add_command_to_table,
+    format_command_row,
+    make_row_formatter,
+    write_command_rows_plain,
     print_summary,
 )
 from .coredump_parser import CoredumpParser, parse_coredump
@@ -67,7 +71,11 @@ __all__ = [
     "CoredumpParser",
     # Functions
     "create_command_table",
+    "create_command_table_bulk",
     "add_command_to_table",
+    "format_command_row",
+    "make_row_formatter",
+    "write_command_rows_plain",
     "print_summary",
     "parse_coredump",
 ]
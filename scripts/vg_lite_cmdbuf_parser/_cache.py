@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VGLite 解析结果缓存
+===================
+按日志文件指纹和解析选项把解析结果缓存到磁盘，
+反复解析同一个日志时直接加载，跳过解析阶段
+
+缓存目录: $XDG_CACHE_HOME/vg_lite_cmdbuf_parser (默认 ~/.cache/vg_lite_cmdbuf_parser)
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import stat
+import tempfile
+from typing import Any, Optional
+
+# 缓存格式版本，解析结果的结构变化时递增使旧缓存失效
+_CACHE_VERSION = 1
+
+# 指纹只读取文件头尾各 64KB，配合大小和修改时间判断文件是否变化
+_SAMPLE_SIZE = 64 * 1024
+
+
+def _cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "vg_lite_cmdbuf_parser")
+
+
+@functools.lru_cache(maxsize=1)
+def _source_stamp() -> tuple:
+    """解析器源码的大小和修改时间，代码更新后旧缓存自动失效"""
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    stamp = []
+    for name in sorted(os.listdir(src_dir)):
+        if name.endswith(".py"):
+            st = os.stat(os.path.join(src_dir, name))
+            stamp.append((name, st.st_size, st.st_mtime_ns))
+    return tuple(stamp)
+
+
+def make_key(filename: str, **options) -> Optional[str]:
+    """
+    计算缓存键
+
+    Args:
+        filename: 日志文件路径
+        options: 影响解析结果的选项
+
+    Returns:
+        缓存键，文件不可缓存 (非普通文件或无法读取) 时返回 None
+    """
+    try:
+        st = os.stat(filename)
+        if not stat.S_ISREG(st.st_mode):
+            return None
+
+        h = hashlib.sha1()
+        with open(filename, "rb") as f:
+            h.update(f.read(_SAMPLE_SIZE))
+            if st.st_size > _SAMPLE_SIZE:
+                f.seek(max(_SAMPLE_SIZE, st.st_size - _SAMPLE_SIZE))
+                h.update(f.read(_SAMPLE_SIZE))
+    except OSError:
+        return None
+
+    meta = (
+        _CACHE_VERSION,
+        _source_stamp(),
+        st.st_size,
+        st.st_mtime_ns,
+        sorted(options.items()),
+    )
+    h.update(repr(meta).encode("utf-8"))
+    return h.hexdigest()
+
+
+def load(key: str) -> Optional[Any]:
+    """读取缓存，不存在或无法加载时返回 None"""
+    path = os.path.join(_cache_dir(), f"{key}.pickle")
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # 缓存损坏或数据类已变化，当作未命中
+        return None
+
+
+def save(key: str, value: Any):
+    """写入缓存 (先写临时文件再替换，失败时静默忽略)"""
+    cache_dir = _cache_dir()
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, os.path.join(cache_dir, f"{key}.pickle"))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, pickle.PicklingError):
+        pass
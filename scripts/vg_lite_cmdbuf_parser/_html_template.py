@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VGLite HTML 可视化模板
+======================
+SVGExporter.export_html 使用的交互式页面模板
+
+{{name}} 为导出时填入的字段，其余内容 (CSS/JS 中的花括号) 原样输出
+"""
+
+import re
+
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>VGLite Visualization</title>
+    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            margin: 0;
+            padding: 20px;
+            background: #f5f5f5;
+        }
+        .container {
+            max-width: 2000px;
+            margin: 0 auto;
+        }
+        h1 {
+            color: #333;
+            margin-bottom: 20px;
+        }
+        .canvas-row {
+            display: flex;
+            gap: 20px;
+            flex-wrap: wrap;
+            align-items: flex-start;
+        }
+        .canvas-panel {
+            background: white;
+            border: 1px solid #ddd;
+            border-radius: 8px;
+            padding: 20px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        .canvas-panel h3 {
+            margin: 0 0 15px 0;
+            color: #555;
+            font-size: 14px;
+            border-bottom: 1px solid #eee;
+            padding-bottom: 10px;
+        }
+        .svg-container {
+            display: inline-block;
+            overflow: visible;
+        }
+        .image-container {
+            display: inline-block;
+        }
+        .controls {
+            margin-bottom: 20px;
+        }
+        .controls label {
+            margin-right: 20px;
+        }
+        .info {
+            margin-top: 20px;
+            padding: 15px;
+            background: #e8f4fc;
+            border-radius: 4px;
+        }
+        .path-data {
+            max-height: 300px;
+            overflow-y: auto;
+            background: #f0f0f0;
+            padding: 10px;
+            border-radius: 4px;
+            margin-top: 10px;
+            font-family: monospace;
+            font-size: 12px;
+            word-break: break-all;
+            white-space: pre-wrap;
+        }
+        svg {
+            display: block;
+        }
+        svg path {
+            cursor: pointer;
+        }
+        #highlightGroup path {
+            pointer-events: none;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>VGLite GPU 渲染可视化</h1>
+        <div class="controls">
+            <label>
+                <input type="checkbox" id="showGrid" onchange="toggleGrid()"> 显示网格
+            </label>
+            <label>
+                <input type="checkbox" id="showCrosshair" onchange="toggleCrosshair()"> 显示光标
+            </label>
+            <label>
+                <input type="checkbox" id="showScissor" onchange="toggleScissor()"> 显示裁剪区域
+            </label>
+            <label>
+                <input type="checkbox" id="showBbox" onchange="toggleBbox()"> 显示路径边界
+            </label>
+            <label>
+                背景色: <input type="color" id="bgColor" value="#000000" oninput="updateBgColor()">
+            </label>
+            <label>
+                渲染进度: <input type="range" id="drawOrder" min="0" max="{{total}}" step="1" value="{{total}}" oninput="updateDrawOrder()" style="width: 120px;">
+                <span id="drawOrderValue">{{total}}/{{total}}</span>
+            </label>
+        </div>
+        <div class="canvas-row">
+            <div class="canvas-panel">
+                <h3>渲染命令重放</h3>
+                <div class="svg-container" id="svgContainer">
+                    {{svg_content}}
+                </div>
+            </div>
+            {{target_buffer_image_html}}
+        </div>
+        <div class="info">
+            <strong>统计信息:</strong> 共 {{total}} 个绘制命令<br>
+            <strong>画布尺寸:</strong> {{width}} x {{height}}<br>{{target_info_html}}{{context_state_html}}
+            <strong>鼠标位置:</strong> <span id="mousePos">X: -, Y: -</span><br>
+            <span id="pathInfo" style="display: none;"><br><strong>选中路径 #<span id="piIndex"></span>:</strong><br>
+            <span id="piSplit" style="color: #ff9800; font-weight: bold;">⚠ VGLite SPLIT x<span id="piSplitCount"></span><br></span>
+            颜色: <span id="piColor"></span><br>
+            填充规则: <span id="piFillRule"></span><br>
+            <span id="piBbox">路径边界: <span id="piBboxText"></span><br></span>
+            变换矩阵: <code id="piTransform"></code><br>
+            路径长度: <span id="piLength"></span> 字符<br>
+            <div class="path-data" id="piPathData"></div></span>
+        </div>
+    </div>
+    <script>
+        function toggleGrid() {
+            const svg = document.querySelector('svg');
+            const showGrid = document.getElementById('showGrid').checked;
+            let grid = document.getElementById('gridPattern');
+            
+            if (showGrid && !grid) {
+                const defs = document.createElementNS('http://www.w3.org/2000/svg', 'defs');
+                defs.innerHTML = `
+                    <pattern id="gridPattern" width="20" height="20" patternUnits="userSpaceOnUse">
+                        <path d="M 20 0 L 0 0 0 20" fill="none" stroke="#ddd" stroke-width="0.5"/>
+                    </pattern>
+                `;
+                svg.insertBefore(defs, svg.firstChild);
+                
+                const gridRect = document.createElementNS('http://www.w3.org/2000/svg', 'rect');
+                gridRect.setAttribute('id', 'gridRect');
+                gridRect.setAttribute('width', '100%');
+                gridRect.setAttribute('height', '100%');
+                gridRect.setAttribute('fill', 'url(#gridPattern)');
+                const bgRect = svg.querySelector('rect');
+                bgRect.parentNode.insertBefore(gridRect, bgRect.nextSibling);
+            } else if (!showGrid) {
+                const gridRect = document.getElementById('gridRect');
+                if (gridRect) gridRect.remove();
+                const defs = svg.querySelector('defs');
+                if (defs) defs.remove();
+            }
+        }
+        
+        function updateBgColor() {
+            const color = document.getElementById('bgColor').value;
+            const bgRect = document.querySelector('svg > rect');
+            if (bgRect) bgRect.setAttribute('fill', color);
+        }
+        
+        // 渲染进度控制
+        // 绘制路径及其序号在加载时收集一次，拖动滑块时不再查询 DOM 和解析属性
+        const drawPaths = Array.from(document.querySelectorAll('svg path[data-index]'));
+        const drawPathIndices = drawPaths.map(path => parseInt(path.getAttribute('data-index')));
+        // 当前显示的路径数量，序号小于它的路径可见
+        let shownDrawCount = {{total}};
+        
+        function updateDrawOrder() {
+            const value = parseInt(document.getElementById('drawOrder').value);
+            const total = {{total}};
+            document.getElementById('drawOrderValue').textContent = `${value}/${total}`;
+            
+            // 只改写可见性发生变化的那一段路径，其余路径的样式保持不动
+            const lo = Math.min(value, shownDrawCount);
+            const hi = Math.max(value, shownDrawCount);
+            const display = value > shownDrawCount ? '' : 'none';
+            drawPaths.forEach((path, i) => {
+                const pathIndex = drawPathIndices[i];
+                if (pathIndex >= lo && pathIndex < hi) {
+                    path.style.display = display;
+                }
+            });
+            shownDrawCount = value;
+        }
+        
+        // 光标功能
+        let crosshairEnabled = false;
+        let crosshairH = null;
+        let crosshairV = null;
+        
+        function toggleCrosshair() {
+            crosshairEnabled = document.getElementById('showCrosshair').checked;
+            if (!crosshairEnabled) {
+                if (crosshairH) { crosshairH.remove(); crosshairH = null; }
+                if (crosshairV) { crosshairV.remove(); crosshairV = null; }
+                // 同时隐藏目标缓冲区的光标
+                const targetH = document.getElementById('targetCrosshairH');
+                const targetV = document.getElementById('targetCrosshairV');
+                if (targetH) targetH.style.display = 'none';
+                if (targetV) targetV.style.display = 'none';
+            }
+        }
+        
+        function toggleScissor() {
+            const showScissor = document.getElementById('showScissor').checked;
+            const scissorRect = document.getElementById('scissorRect');
+            if (scissorRect) {
+                scissorRect.style.display = showScissor ? '' : 'none';
+            }
+        }
+        
+        // 当前选中的路径索引及其元素
+        var selectedPathIndex = -1;
+        var selectedPath = null;
+        
+        // 选中路径的边界矩形，首次显示时创建，之后复用同一个元素
+        let bboxRect = null;
+        
+        function toggleBbox() {
+            updateSelectedBbox();
+        }
+        
+        function updateSelectedBbox() {
+            const showBbox = document.getElementById('showBbox').checked;
+            
+            if (!showBbox || selectedPathIndex < 0 || !selectedPath.hasAttribute('data-bbox-x')) {
+                if (bboxRect) bboxRect.style.display = 'none';
+                return;
+            }
+            
+            if (!bboxRect) {
+                bboxRect = document.createElementNS('http://www.w3.org/2000/svg', 'rect');
+                bboxRect.setAttribute('class', 'bbox-rect');
+                bboxRect.setAttribute('fill', 'none');
+                bboxRect.setAttribute('stroke', '#ff00ff');
+                bboxRect.setAttribute('stroke-width', '1');
+                bboxRect.setAttribute('stroke-dasharray', '3,3');
+                // 位于高亮层之上
+                const highlightGroup = document.getElementById('highlightGroup');
+                highlightGroup.parentNode.insertBefore(bboxRect, highlightGroup.nextSibling);
+            }
+            
+            // 显示选中路径的边界 (坐标取自路径上的 data-bbox-* 属性)
+            bboxRect.setAttribute('x', selectedPath.getAttribute('data-bbox-x'));
+            bboxRect.setAttribute('y', selectedPath.getAttribute('data-bbox-y'));
+            bboxRect.setAttribute('width', selectedPath.getAttribute('data-bbox-w'));
+            bboxRect.setAttribute('height', selectedPath.getAttribute('data-bbox-h'));
+            bboxRect.style.display = '';
+        }
+        
+        function updateCrosshair(x, y) {
+            if (!crosshairEnabled) return;
+            
+            if (!crosshairH) {
+                crosshairH = document.createElementNS('http://www.w3.org/2000/svg', 'line');
+                crosshairH.setAttribute('stroke', '#00ff00');
+                crosshairH.setAttribute('stroke-width', '1');
+                crosshairH.setAttribute('stroke-dasharray', '4,4');
+                crosshairH.style.pointerEvents = 'none';
+                crosshairH.setAttribute('x1', '0');
+                crosshairH.setAttribute('x2', '{{width}}');
+                svg.appendChild(crosshairH);
+            }
+            if (!crosshairV) {
+                crosshairV = document.createElementNS('http://www.w3.org/2000/svg', 'line');
+                crosshairV.setAttribute('stroke', '#00ff00');
+                crosshairV.setAttribute('stroke-width', '1');
+                crosshairV.setAttribute('stroke-dasharray', '4,4');
+                crosshairV.style.pointerEvents = 'none';
+                crosshairV.setAttribute('y1', '0');
+                crosshairV.setAttribute('y2', '{{height}}');
+                svg.appendChild(crosshairV);
+            }
+            
+            // 水平线 (两端的 x 在创建时已设置，只更新 y)
+            crosshairH.setAttribute('y1', y);
+            crosshairH.setAttribute('y2', y);
+            
+            // 垂直线 (两端的 y 在创建时已设置，只更新 x)
+            crosshairV.setAttribute('x1', x);
+            crosshairV.setAttribute('x2', x);
+            
+            // 同步更新目标缓冲区的光标
+            updateTargetCrosshair(x, y);
+        }
+        
+        function updateTargetCrosshair(x, y) {
+            const targetContainer = document.getElementById('targetBufferContainer');
+            const targetImg = document.getElementById('targetBufferImg');
+            const targetH = document.getElementById('targetCrosshairH');
+            const targetV = document.getElementById('targetCrosshairV');
+            
+            if (!targetContainer || !targetImg || !targetH || !targetV) return;
+            if (!crosshairEnabled) {
+                targetH.style.display = 'none';
+                targetV.style.display = 'none';
+                return;
+            }
+            
+            // 计算目标图像的缩放比例
+            const imgRect = targetImg.getBoundingClientRect();
+            const scaleX = imgRect.width / {{width}};
+            const scaleY = imgRect.height / {{height}};
+            
+            // 计算目标图像上的光标位置
+            const targetX = x * scaleX;
+            const targetY = y * scaleY;
+            
+            targetH.style.display = '';
+            targetH.style.top = targetY + 'px';
+            
+            targetV.style.display = '';
+            targetV.style.left = targetX + 'px';
+        }
+        
+        function hideTargetCrosshair() {
+            const targetH = document.getElementById('targetCrosshairH');
+            const targetV = document.getElementById('targetCrosshairV');
+            if (targetH) targetH.style.display = 'none';
+            if (targetV) targetV.style.display = 'none';
+        }
+        
+        // 鼠标位置追踪
+        const svg = document.querySelector('svg');
+        const mousePos = document.getElementById('mousePos');
+        // 最近一次鼠标事件的位置，每帧只刷新一次坐标显示和光标
+        let pendingMouseEvent = null;
+        // 上一次刷新时的坐标和显示文本，未变化时跳过 DOM 写入
+        let lastMouseX = null;
+        let lastMouseY = null;
+        let lastMouseText = '';
+        
+        function flushMousePos() {
+            const e = pendingMouseEvent;
+            pendingMouseEvent = null;
+            if (!e) return;
+            
+            const rect = svg.getBoundingClientRect();
+            // 计算相对于 SVG 画布的坐标
+            const x = e.clientX - rect.left;
+            const y = e.clientY - rect.top;
+            if (x === lastMouseX && y === lastMouseY) return;
+            lastMouseX = x;
+            lastMouseY = y;
+            
+            const text = `X: ${Math.round(x)}, Y: ${Math.round(y)}`;
+            if (text !== lastMouseText) {
+                mousePos.textContent = text;
+                lastMouseText = text;
+            }
+            updateCrosshair(x, y);
+        }
+        
+        svg.addEventListener('mousemove', function(e) {
+            if (!pendingMouseEvent) {
+                requestAnimationFrame(flushMousePos);
+            }
+            pendingMouseEvent = e;
+        });
+        
+        svg.addEventListener('mouseleave', function() {
+            // 丢弃尚未刷新的位置，避免离开后光标又被画出来
+            pendingMouseEvent = null;
+            lastMouseX = lastMouseY = null;
+            lastMouseText = 'X: -, Y: -';
+            mousePos.textContent = lastMouseText;
+            if (crosshairH) { crosshairH.remove(); crosshairH = null; }
+            if (crosshairV) { crosshairV.remove(); crosshairV = null; }
+            hideTargetCrosshair();
+        });
+        
+        // 将SVG路径格式转换为 MOVE,x,y 格式，每条命令一行
+        // 按空白切分后单次扫描，不再对整条路径反复执行正则替换
+        const pathOpNames = {M: 'MOVE', L: 'LINE', Q: 'QUAD', C: 'CUBIC', Z: 'CLOSE'};
+        
+        function formatPath(svgPath) {
+            const lines = [];
+            let line = null;
+            for (const token of svgPath.split(/[\\s,]+/)) {
+                if (!token) continue;
+                const name = pathOpNames[token];
+                if (name) {
+                    if (line !== null) lines.push(line);
+                    line = name + ',';
+                } else if (line !== null) {
+                    line += token + ',';
+                }
+            }
+            if (line !== null) lines.push(line);
+            lines.push('END,');
+            return lines.join('\\n');
+        }
+        
+        // 高亮显示函数
+        function highlightPath(pathElement) {
+            const highlightGroup = document.getElementById('highlightGroup');
+            // 清除之前的高亮
+            highlightGroup.innerHTML = '';
+            
+            if (!pathElement) return;
+            
+            // 复制路径并设置半透明高亮样式
+            const highlightPath = pathElement.cloneNode(true);
+            highlightPath.removeAttribute('data-index');
+            highlightPath.removeAttribute('data-hash');
+            highlightPath.removeAttribute('data-split-count');
+            highlightPath.removeAttribute('data-bbox-x');
+            highlightPath.removeAttribute('data-bbox-y');
+            highlightPath.removeAttribute('data-bbox-w');
+            highlightPath.removeAttribute('data-bbox-h');
+            highlightPath.setAttribute('fill', '#00ff00');
+            highlightPath.setAttribute('fill-opacity', '0.4');
+            highlightPath.style.pointerEvents = 'none';
+            
+            // 如果路径在 <g> 中，需要保持 clip-path
+            const parentG = pathElement.parentElement;
+            if (parentG && parentG.tagName === 'g' && parentG.getAttribute('clip-path')) {
+                const highlightG = document.createElementNS('http://www.w3.org/2000/svg', 'g');
+                highlightG.setAttribute('clip-path', parentG.getAttribute('clip-path'));
+                highlightG.appendChild(highlightPath);
+                highlightGroup.appendChild(highlightG);
+            } else {
+                highlightGroup.appendChild(highlightPath);
+            }
+        }
+        
+        function setPathInfo(id, text) {
+            document.getElementById(id).textContent = text;
+        }
+        
+        // 路径点击事件: 在 SVG 根节点上统一处理，不再给每条路径单独注册监听
+        svg.addEventListener('click', function(e) {
+            const path = e.target.closest('path[data-index]');
+            if (!path) return;
+            
+            // 高亮选中的路径
+            highlightPath(path);
+            
+            const index = path.getAttribute('data-index');
+            selectedPathIndex = parseInt(index);
+            selectedPath = path;
+            
+            // 更新选中路径的 bbox 显示
+            updateSelectedBbox();
+            
+            const d = path.getAttribute('d');
+            const fill = path.getAttribute('fill');
+            const fillOpacity = path.getAttribute('fill-opacity');
+            const fillRule = path.getAttribute('fill-rule');
+            const transform = path.getAttribute('transform') || '无';
+            const splitCount = path.getAttribute('data-split-count');
+            const bboxX = path.getAttribute('data-bbox-x');
+            const bboxY = path.getAttribute('data-bbox-y');
+            const bboxW = path.getAttribute('data-bbox-w');
+            const bboxH = path.getAttribute('data-bbox-h');
+            
+            // 信息面板的结构固定，只更新各字段的文本，不再每次重建 HTML
+            setPathInfo('piIndex', index);
+            
+            // split 信息（如果存在）
+            const isSplit = splitCount && parseInt(splitCount) > 1;
+            document.getElementById('piSplit').style.display = isSplit ? '' : 'none';
+            if (isSplit) setPathInfo('piSplitCount', splitCount);
+            
+            setPathInfo('piColor', `${fill} (透明度: ${fillOpacity})`);
+            setPathInfo('piFillRule', fillRule);
+            
+            // bounding box 信息
+            const hasBbox = bboxX && bboxY && bboxW && bboxH;
+            document.getElementById('piBbox').style.display = hasBbox ? '' : 'none';
+            if (hasBbox) setPathInfo('piBboxText', `(${bboxX}, ${bboxY}) - ${bboxW}x${bboxH}`);
+            
+            setPathInfo('piTransform', transform);
+            setPathInfo('piLength', d.length);
+            setPathInfo('piPathData', formatPath(d));
+            document.getElementById('pathInfo').style.display = '';
+        });
+    </script>
+</body>
+</html>"""
+
+# 模块加载时切分一次: [静态文本, 字段名, 静态文本, 字段名, ..., 静态文本]
+HTML_PARTS = tuple(re.split(r"\{\{(\w+)\}\}", _HTML_TEMPLATE))
@@ -0,0 +1,113 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+# -*- coding: utf-8 -*-
+"""
+VGLite 路径数据解析 (Cython 加速版)
+===================================
+与 VGLitePathParser._parse_bytes 逻辑一致的 C 实现，可选构建:
+
+  pip install cython
+  cythonize -i _path_parser_c.pyx
+
+未构建时 path_parser 自动使用纯 Python 实现
+"""
+
+# 路径格式编码，与 path_parser._FORMAT_CODES 对应
+cdef enum:
+    FMT_S8 = 1
+    FMT_S16 = 2
+    FMT_S32 = 3
+    FMT_FP32 = 4
+
+
+cdef inline unsigned int _read_u32(const unsigned char[::1] buf, Py_ssize_t off):
+    return (
+        <unsigned int>buf[off]
+        | (<unsigned int>buf[off + 1] << 8)
+        | (<unsigned int>buf[off + 2] << 16)
+        | (<unsigned int>buf[off + 3] << 24)
+    )
+
+
+cdef inline unsigned int _read_u16(const unsigned char[::1] buf, Py_ssize_t off):
+    return <unsigned int>buf[off] | (<unsigned int>buf[off + 1] << 8)
+
+
+cdef union _U32F32:
+    unsigned int u
+    float f
+
+
+def parse_bytes(const unsigned char[::1] data, int fmt, dict op_codes, segment_cls):
+    """
+    从字节流解析路径段
+
+    Args:
+        data: 路径数据字节流 (bytes/bytearray)
+        fmt: 路径格式编码 (1=S8, 2=S16, 3=S32, 4=FP32)
+        op_codes: 操作码表 {opcode: (名称, 坐标数)}
+        segment_cls: 路径段类型 (PathSegment)
+
+    Returns:
+        解析后的路径段列表
+    """
+    cdef Py_ssize_t n = data.shape[0]
+    cdef Py_ssize_t offset = 0
+    cdef Py_ssize_t size
+    cdef Py_ssize_t coord_count, k
+    cdef unsigned int opcode
+    cdef _U32F32 cvt
+    cdef list segments = []
+    cdef list coords
+
+    if fmt == FMT_S8:
+        size = 1
+    elif fmt == FMT_S16:
+        size = 2
+    else:
+        size = 4
+
+    while offset < n:
+        # 读取操作码
+        if offset + size > n:
+            break
+        if fmt == FMT_S8:
+            opcode = data[offset]
+        elif fmt == FMT_S16:
+            opcode = _read_u16(data, offset)
+        else:
+            opcode = _read_u32(data, offset)
+
+        op_info = op_codes.get(opcode & 0xFF)
+        if op_info is None:
+            # 未知操作码，尝试跳过
+            offset += size
+            continue
+
+        op_name, count = op_info
+        coord_count = count
+
+        # 读取坐标数据
+        offset += size  # 跳过操作码
+        coords = []
+        for k in range(coord_count):
+            if offset >= n:
+                break
+            if offset + size <= n:
+                if fmt == FMT_S8:
+                    coords.append(<double>(<signed char>data[offset]))
+                elif fmt == FMT_S16:
+                    coords.append(<double>(<short>_read_u16(data, offset)))
+                elif fmt == FMT_S32:
+                    coords.append(<double>(<int>_read_u32(data, offset)))
+                else:
+                    cvt.u = _read_u32(data, offset)
+                    coords.append(<double>cvt.f)
+            offset += size
+
+        segments.append(segment_cls(opcode=opcode, op_name=op_name, coords=coords))
+
+        # 遇到 END 或 CLOSE 可以继续解析（可能有多个子路径）
+        if opcode == 0x00:  # END
+            break
+
+    return segments
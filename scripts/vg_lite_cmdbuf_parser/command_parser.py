@@ -8,7 +8,9 @@ VGLite 命令缓冲区解析器
 
 import re
 import struct
-from typing import List, Optional, Tuple
+import sys
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 try:
     from .constants import (
@@ -36,24 +38,86 @@ except ImportError:
     from path_parser import VGLitePathParser
 
 
+# 日志清理 / 命令匹配用的正则，模块加载时编译一次
+_RE_ANSI = re.compile(r"(\x1b|\033|\^\[)\[[0-9;]*m")
+_RE_LOG_PREFIX = re.compile(r"^.*?\[ap\]\s*", re.IGNORECASE)
+_RE_TIMESTAMP = re.compile(r"^\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}[.\d]*\s*")
+_RE_BRACKET_TAGS = re.compile(r"\[[^\]]*\]\s*")
+_RE_HEX_START = re.compile(r"^\s*0x")
+_RE_CMD_PAIR = re.compile(r"(0x[0-9A-Fa-f]{8})\s+(0x[0-9A-Fa-f]{8})")
+_RE_SECTION_ADDR = re.compile(r"addr\s+(0x[0-9A-Fa-f]+)", re.IGNORECASE)
+_RE_SECTION_SIZE = re.compile(r"size\s+(0x[0-9A-Fa-f]+)", re.IGNORECASE)
+# 预筛: 不在路径数据中且不含这些关键字的行不可能产生命令或分段，跳过清理和匹配
+_RE_PREFILTER = re.compile(r"0x|command buffer|submit command", re.IGNORECASE)
+
+
+def _iter_decoded_lines(data) -> Iterator[str]:
+    """逐行解码字节数据 (bytes/bytearray/mmap/memoryview)"""
+    if isinstance(data, memoryview):
+        # memoryview 不支持 find，转成 bytes 后再切分
+        data = data.tobytes()
+    start, end = 0, len(data)
+    while start < end:
+        nl = data.find(b"\n", start)
+        if nl < 0:
+            nl = end
+        yield data[start:nl].decode("utf-8", errors="ignore")
+        start = nl + 1
+
+
 class VGLiteCommandParser:
     """VGLite命令缓冲区解析器"""
 
+    @classmethod
+    def precompile(cls) -> int:
+        """预热: 确保模块级正则已在首次解析之前编译
+
+        Returns:
+            预编译的正则数量
+        """
+        patterns = (
+            _RE_ANSI,
+            _RE_LOG_PREFIX,
+            _RE_TIMESTAMP,
+            _RE_BRACKET_TAGS,
+            _RE_HEX_START,
+            _RE_CMD_PAIR,
+            _RE_SECTION_ADDR,
+            _RE_SECTION_SIZE,
+            _RE_PREFILTER,
+        )
+        return len(patterns)
+
     def __init__(
         self, verbose: bool = False, parse_path: bool = False, parse_image: bool = False
     ):
         self.verbose = verbose
         self.parse_path = parse_path
         self.parse_image = parse_image
+        self.reset()
+
+    def reset(self):
+        """清空解析结果和内部状态，保留配置，以便复用同一实例
+
+        重新创建列表而不是原地清空，之前返回的结果不受影响
+        """
         self.commands: List[ParsedCommand] = []
         self.abnormal_commands: List[ParsedCommand] = []
         self.current_path_format = "FP32"  # 默认路径格式
         # 分段存储命令
         self.command_sections: List[dict] = []
         self.current_section: dict = None
+        # 逐行解析的行间状态
+        self._offset = 0
+        self._skip_lines = 0
+        self._pending_path_data: list = []
 
         # 图片绘制跟踪
         self.image_draws: List[ImageDrawInfo] = []
+        # 命令偏移 -> 图片绘制记录 (同一偏移保留第一条)，供输出时按偏移查找
+        # 偏移在每个命令段内从 0 重新计数，image_draws 整体并不按偏移有序，
+        # 因此用字典而不是对偏移数组二分查找
+        self.image_by_offset: Dict[int, ImageDrawInfo] = {}
         self._current_image = ImageDrawInfo()
         self._image_matrix = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0]
         self._current_blend = "SRC_OVER"
@@ -77,12 +141,13 @@ class VGLiteCommandParser:
             dst_width=self._current_image.dst_width,
             dst_height=self._current_image.dst_height,
             dst_stride=self._current_image.dst_stride,
-            matrix=self._image_matrix.copy(),
+            matrix=tuple(self._image_matrix),
             blend_mode=self._current_blend,
             offset=offset,
             section_name=self.current_section["name"] if self.current_section else "",
         )
         self.image_draws.append(img)
+        self.image_by_offset.setdefault(offset, img)
 
         # 重置源地址（但保留目标信息，因为可能多次绘制到同一目标）
         self._current_image.src_address = 0
@@ -97,21 +162,17 @@ class VGLiteCommandParser:
     def clean_log_line(line: str) -> str:
         """清理日志行，移除时间戳、ANSI颜色码等前缀"""
         # 移除ANSI转义序列 (颜色码等)
-        ansi_pattern = r"(\x1b|\033|\^\[)\[[0-9;]*m"
-        line = re.sub(ansi_pattern, "", line)
+        line = _RE_ANSI.sub("", line)
 
         # 移除常见的日志前缀格式
-        log_prefix_pattern = r"^.*?\[ap\]\s*"
-        line = re.sub(log_prefix_pattern, "", line, flags=re.IGNORECASE)
+        line = _RE_LOG_PREFIX.sub("", line)
 
         # 如果上面的模式没匹配，尝试更通用的方式
-        timestamp_pattern = r"^\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}[.\d]*\s*"
-        line = re.sub(timestamp_pattern, "", line)
+        line = _RE_TIMESTAMP.sub("", line)
 
         # 移除方括号标签
-        bracket_tags_pattern = r"\[[^\]]*\]\s*"
-        if not re.match(r"^\s*0x", line):
-            line = re.sub(bracket_tags_pattern, "", line)
+        if not _RE_HEX_START.match(line):
+            line = _RE_BRACKET_TAGS.sub("", line)
 
         return line.strip()
 
@@ -120,8 +181,7 @@ class VGLiteCommandParser:
         cleaned_line = self.clean_log_line(line)
 
         # 匹配格式: 0xXXXXXXXX 0xXXXXXXXX
-        pattern = r"(0x[0-9A-Fa-f]{8})\s+(0x[0-9A-Fa-f]{8})"
-        match = re.search(pattern, cleaned_line)
+        match = _RE_CMD_PAIR.search(cleaned_line)
         if not match:
             return None
 
@@ -268,7 +328,8 @@ class VGLiteCommandParser:
 
         if address == 0x0A00:  # VgControl
             blend = data & 0x00000F00
-            blend_name = BLEND_MODES.get(blend, f"0x{blend:04X}")
+            # 未知值会生成新字符串，驻留后与已知名称一样在各记录间共享
+            blend_name = sys.intern(BLEND_MODES.get(blend, f"0x{blend:04X}"))
             details.append(f"混合模式: {blend_name}")
             if self.parse_image:
                 self._current_blend = blend_name
@@ -362,7 +423,7 @@ class VGLiteCommandParser:
 
         elif address == 0x0A13:  # VgTargetConfig
             fmt = data & 0x3F
-            fmt_name = IMAGE_FORMATS.get(fmt, f"0x{fmt:02X}")
+            fmt_name = sys.intern(IMAGE_FORMATS.get(fmt, f"0x{fmt:02X}"))
             details.append(f"目标格式: {fmt_name}")
             if self.parse_image:
                 self._current_image.dst_format = fmt_name
@@ -372,7 +433,7 @@ class VGLiteCommandParser:
             fmt = data & 0x3F
             filter_mode = (data >> 16) & 0x3
             filter_names = {0: "POINT", 1: "LINEAR", 2: "BI_LINEAR", 3: "GAUSSIAN"}
-            fmt_name = IMAGE_FORMATS.get(fmt, f"0x{fmt:02X}")
+            fmt_name = sys.intern(IMAGE_FORMATS.get(fmt, f"0x{fmt:02X}"))
             filter_name = filter_names.get(filter_mode, "?")
             details.append(f"源格式: {fmt_name}, 滤波: {filter_name}")
             if self.parse_image:
@@ -430,125 +491,163 @@ class VGLiteCommandParser:
 
         return details
 
-    def parse_log(self, log_text: str) -> List[ParsedCommand]:
-        """解析完整日志"""
+    def parse_log(
+        self, log_text: Union[str, bytes, bytearray, memoryview]
+    ) -> List[ParsedCommand]:
+        """解析完整日志
+
+        Args:
+            log_text: 日志文本，也可以是 bytes/memoryview/mmap，此时按行解码，
+                不整体转换为 str
+        """
+        if isinstance(log_text, str):
+            return self.parse_log_iter(log_text.strip().split("\n"))
+        return self.parse_log_iter(_iter_decoded_lines(log_text))
+
+    def parse_log_iter(self, line_iter: Iterable[str]) -> List[ParsedCommand]:
+        """逐行解析日志
+
+        Args:
+            line_iter: 日志行迭代器 (如打开的文件对象)，按需逐行消费
+
+        Returns:
+            解析后的命令列表
+        """
+        self.begin()
+        for line in line_iter:
+            self.feed_line(line)
+        return self.finalize()
+
+    def begin(self):
+        """开始新一轮逐行解析，清空上次的结果和行间状态"""
         self.commands = []
         self.command_sections = []
         self.current_section = None
-        offset = 0
-        skip_lines = 0
-        pending_path_data = []
-
-        def start_new_section(name: str):
-            nonlocal offset
-            if self.current_section and self.current_section["commands"]:
-                self.command_sections.append(self.current_section)
-            self.current_section = {
-                "name": name,
-                "address": None,
-                "size": None,
-                "commands": [],
-                "abnormal_commands": [],
-            }
-            offset = 0
-
-        lines = log_text.strip().split("\n")
-        i = 0
-        while i < len(lines):
-            original_line = lines[i]
-            line = self.clean_log_line(original_line)
-            i += 1
-
-            if not line:
-                continue
-
-            line_lower = line.lower()
-            if "init command buffer" in line_lower:
-                start_new_section("初始化命令缓冲区")
-                continue
-            if "last submit command" in line_lower:
-                if "before hang" in line_lower:
-                    start_new_section("挂起前最后提交的命令")
+        self._offset = 0
+        self._skip_lines = 0
+        self._pending_path_data = []
+
+    def _start_new_section(self, name: str):
+        if self.current_section and self.current_section["commands"]:
+            self.command_sections.append(self.current_section)
+        self.current_section = {
+            "name": name,
+            "address": None,
+            "size": None,
+            "commands": [],
+            "abnormal_commands": [],
+            # 解析时逐条累计的命令类型统计，汇总时无需再遍历命令
+            "cmd_type_counts": Counter(),
+        }
+        self._offset = 0
+
+    def feed_line(self, original_line: str):
+        """推入一行日志 (需先调用 begin，全部推入后调用 finalize)"""
+        if not self._skip_lines and not _RE_PREFILTER.search(original_line):
+            return
+
+        line = self.clean_log_line(original_line)
+
+        if not line:
+            return
+
+        line_lower = line.lower()
+        if "init command buffer" in line_lower:
+            self._start_new_section("初始化命令缓冲区")
+            return
+        if "last submit command" in line_lower:
+            if "before hang" in line_lower:
+                self._start_new_section("挂起前最后提交的命令")
+            else:
+                self._start_new_section("最后提交的命令")
+            return
+        if "addr 0x" in line_lower and "size 0x" in line_lower:
+            addr_match = _RE_SECTION_ADDR.search(line)
+            size_match = _RE_SECTION_SIZE.search(line)
+            if addr_match and size_match and self.current_section:
+                self.current_section["address"] = addr_match.group(1)
+                self.current_section["size"] = size_match.group(1)
+            return
+        if "idle reg" in line_lower or "vg idle reg" in line_lower:
+            return
+
+        if self._skip_lines > 0:
+            match = _RE_CMD_PAIR.search(line)
+            if match:
+                d1 = int(match.group(1), 16)
+                d2 = int(match.group(2), 16)
+                self._pending_path_data.append((d1, d2))
+            self._skip_lines -= 1
+            self._offset += 8
+            return
+
+        cmd = self.parse_line(original_line, self._offset)
+        if cmd:
+            if self.current_section is None:
+                self.current_section = {
+                    "name": "命令缓冲区",
+                    "address": None,
+                    "size": None,
+                    "commands": [],
+                    "abnormal_commands": [],
+                    "cmd_type_counts": Counter(),
+                }
+
+            if self._pending_path_data and self.current_section["commands"]:
+                last_cmd = self.current_section["commands"][-1]
+                if last_cmd.cmd_type == "DATA":
+                    last_cmd.path_data = self._flatten_path_data(
+                        self._pending_path_data
+                    )
+                    if self.parse_path:
+                        path_parser = VGLitePathParser(self.current_path_format)
+                        last_cmd.path_segments = path_parser.parse_path_data(
+                            last_cmd.path_data
+                        )
+            self._pending_path_data = []
+
+            self.current_section["commands"].append(cmd)
+            self.current_section["cmd_type_counts"][cmd.cmd_type] += 1
+            if cmd.is_abnormal:
+                self.current_section["abnormal_commands"].append(cmd)
+            self.commands.append(cmd)
+            if cmd.is_abnormal:
+                self.abnormal_commands.append(cmd)
+            self._offset += 8
+
+            if cmd.cmd_type == "DATA":
+                data_count = cmd.cmd_word & 0x0FFFFFFF
+                MAX_REASONABLE_DATA_COUNT = 0x1000
+                if data_count > MAX_REASONABLE_DATA_COUNT:
+                    self._skip_lines = 0
+                    self._pending_path_data = []
                 else:
-                    start_new_section("最后提交的命令")
-                continue
-            if "addr 0x" in line_lower and "size 0x" in line_lower:
-                addr_match = re.search(r"addr\s+(0x[0-9A-Fa-f]+)", line, re.IGNORECASE)
-                size_match = re.search(r"size\s+(0x[0-9A-Fa-f]+)", line, re.IGNORECASE)
-                if addr_match and size_match and self.current_section:
-                    self.current_section["address"] = addr_match.group(1)
-                    self.current_section["size"] = size_match.group(1)
-                continue
-            if "idle reg" in line_lower or "vg idle reg" in line_lower:
-                continue
-
-            if skip_lines > 0:
-                pattern = r"(0x[0-9A-Fa-f]{8})\s+(0x[0-9A-Fa-f]{8})"
-                match = re.search(pattern, line)
-                if match:
-                    d1 = int(match.group(1), 16)
-                    d2 = int(match.group(2), 16)
-                    pending_path_data.append((d1, d2))
-                skip_lines -= 1
-                offset += 8
-                continue
-
-            cmd = self.parse_line(original_line, offset)
-            if cmd:
-                if self.current_section is None:
-                    self.current_section = {
-                        "name": "命令缓冲区",
-                        "address": None,
-                        "size": None,
-                        "commands": [],
-                        "abnormal_commands": [],
-                    }
-
-                if pending_path_data and self.current_section["commands"]:
-                    last_cmd = self.current_section["commands"][-1]
-                    if last_cmd.cmd_type == "DATA":
-                        last_cmd.path_data = self._flatten_path_data(pending_path_data)
-                        if self.parse_path:
-                            path_parser = VGLitePathParser(self.current_path_format)
-                            last_cmd.path_segments = path_parser.parse_path_data(
-                                last_cmd.path_data
-                            )
-                pending_path_data = []
-
-                self.current_section["commands"].append(cmd)
-                if cmd.is_abnormal:
-                    self.current_section["abnormal_commands"].append(cmd)
-                self.commands.append(cmd)
-                if cmd.is_abnormal:
-                    self.abnormal_commands.append(cmd)
-                offset += 8
-
-                if cmd.cmd_type == "DATA":
-                    data_count = cmd.cmd_word & 0x0FFFFFFF
-                    MAX_REASONABLE_DATA_COUNT = 0x1000
-                    if data_count > MAX_REASONABLE_DATA_COUNT:
-                        skip_lines = 0
-                        pending_path_data = []
-                    else:
-                        skip_lines = data_count
-                        pending_path_data = []
+                    self._skip_lines = data_count
+                    self._pending_path_data = []
+
+    def finalize(self) -> List[ParsedCommand]:
+        """结束逐行解析，收尾当前段和未归属的路径数据
 
+        Returns:
+            解析后的命令列表
+        """
         if self.current_section and self.current_section["commands"]:
             self.command_sections.append(self.current_section)
 
         if (
-            pending_path_data
+            self._pending_path_data
             and self.current_section
             and self.current_section["commands"]
         ):
             last_cmd = self.current_section["commands"][-1]
             if last_cmd.cmd_type == "DATA":
-                last_cmd.path_data = self._flatten_path_data(pending_path_data)
+                last_cmd.path_data = self._flatten_path_data(self._pending_path_data)
                 if self.parse_path:
                     path_parser = VGLitePathParser(self.current_path_format)
                     last_cmd.path_segments = path_parser.parse_path_data(
                         last_cmd.path_data
                     )
+        self._pending_path_data = []
 
         if self.parse_path:
             for cmd in self.commands:
@@ -628,18 +727,14 @@ class VGLiteCommandParser:
                 if section["size"]:
                     print(f"  大小: {section['size']}")
 
-                cmd_counts = {}
-                for cmd in section["commands"]:
-                    cmd_counts[cmd.cmd_type] = cmd_counts.get(cmd.cmd_type, 0) + 1
+                cmd_counts = section["cmd_type_counts"]
 
                 print("  命令统计:")
                 for cmd_type, count in sorted(cmd_counts.items()):
                     print(f"    {cmd_type:15s}: {count:5d}")
                 print(f"    {'总计':15s}: {len(section['commands']):5d}")
 
-                abnormal_in_section = [
-                    cmd for cmd in section["commands"] if cmd.is_abnormal
-                ]
+                abnormal_in_section = section["abnormal_commands"]
                 if abnormal_in_section:
                     print(f"\n  ⚠️  该段检测到 {len(abnormal_in_section)} 个异常命令:")
                     for cmd in abnormal_in_section:
@@ -156,6 +156,8 @@ class CoredumpParser:
         self.symbols: Dict[str, SymbolInfo] = {}
         self.segments: List[CoreSegment] = []
         self.core_data: bytes = b""
+        # read_u32 结果缓存 (地址 -> 值)，core_data 重新加载时清空
+        self._u32_cache: Dict[int, Optional[int]] = {}
 
         self._elf_file = None
         self._core_file = None
@@ -229,6 +231,7 @@ class CoredumpParser:
         """解析 coredump 文件的内存段"""
         with open(self.core_path, "rb") as f:
             self.core_data = f.read()
+            self._u32_cache.clear()
 
             # 重新打开解析 ELF 结构
             f.seek(0)
@@ -297,11 +300,21 @@ class CoredumpParser:
         return None
 
     def read_u32(self, address: int) -> Optional[int]:
-        """读取 32 位无符号整数"""
+        """读取 32 位无符号整数
+
+        符号和结构体字段会被反复读取，结果按地址缓存
+        """
+        try:
+            return self._u32_cache[address]
+        except KeyError:
+            pass
+
+        value = None
         data = self.read_memory(address, 4)
         if data and len(data) == 4:
-            return struct.unpack("<I", data)[0]
-        return None
+            value = struct.unpack("<I", data)[0]
+        self._u32_cache[address] = value
+        return value
 
     def read_pointer(self, address: int) -> Optional[int]:
         """读取指针值（32位系统）"""
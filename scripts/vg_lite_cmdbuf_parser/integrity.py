@@ -7,7 +7,7 @@ VGLite 日志完整性检测器
 """
 
 import re
-from typing import List, Optional
+from typing import Iterable, List, Optional, Union
 
 from rich.console import Console
 from rich.table import Table
@@ -19,77 +19,144 @@ except ImportError:
     from models import LogIntegrityIssue
 
 
+# 检测规则均按字节匹配，避免逐行 Unicode 解码
+_RE_TIMESTAMP = re.compile(rb"\[\d{1,2}/\d{1,2}\s+\d{2}:\d{2}:\d{2}\]")
+_RE_BROKEN_TIMESTAMP = re.compile(rb"\d{2}:\d{2}:\d{3,}")
+_RE_AP_TAG = re.compile(rb"\[ap\]", re.IGNORECASE)
+_RE_TAG_MALFORMED = re.compile(rb"\]\[ap\]", re.IGNORECASE)
+_RE_HEX_WITH_TAG = re.compile(rb"0x[0-9A-Fa-f]{8}\[(?!0x)")
+_RE_CONTINUOUS_HEX = re.compile(rb"0x[0-9A-Fa-f]{8}0x[0-9A-Fa-f]")
+_RE_HEX_PAIR = re.compile(rb"0x[0-9A-Fa-f]{8}\s+0x[0-9A-Fa-f]{8}")
+_RE_TRAILING_NUM = re.compile(rb"\s+(\d{1,3})$")
+_RE_TRAILING_HEX = re.compile(rb"0x[0-9A-Fa-f]+$")
+_RE_REG_INDEX = re.compile(rb"\[\d+\]\s*=")
+
+
+def _decode(data: bytes) -> str:
+    """将字节解码为字符串 (仅在需要展示时调用)"""
+    return data.decode("utf-8", errors="replace")
+
+
 class LogIntegrityChecker:
     """日志完整性检测器
 
     检测日志输出时可能发生的并发冲突、缓冲区溢出等问题导致的数据损坏
     """
 
+    @classmethod
+    def precompile(cls) -> int:
+        """预热: 确保模块级正则已在首次解析之前编译
+
+        Returns:
+            预编译的正则数量
+        """
+        patterns = (
+            _RE_TIMESTAMP,
+            _RE_BROKEN_TIMESTAMP,
+            _RE_AP_TAG,
+            _RE_TAG_MALFORMED,
+            _RE_HEX_WITH_TAG,
+            _RE_CONTINUOUS_HEX,
+            _RE_HEX_PAIR,
+            _RE_TRAILING_NUM,
+            _RE_TRAILING_HEX,
+            _RE_REG_INDEX,
+        )
+        return len(patterns)
+
     def __init__(self):
         self.issues: List[LogIntegrityIssue] = []
+        self._line_number = 0
+
+    def check_line(
+        self, line_number: int, line: Union[bytes, str]
+    ) -> Optional[LogIntegrityIssue]:
+        """检查单行是否有完整性问题
+
+        按字节匹配，只有确实记录问题时才解码原始行
+        """
+        if isinstance(line, str):
+            line = line.encode("utf-8", errors="replace")
+        line = line.rstrip(b"\r\n")
 
-    def check_line(self, line_number: int, line: str) -> Optional[LogIntegrityIssue]:
-        """检查单行是否有完整性问题"""
         problems = []
 
+        # 各规则先做字面量预筛，不可能命中的行不跑正则
+        colon_count = line.count(b":")
+        hex_count = line.count(b"0x")
+
         # 1. 检测时间戳重复/混乱 (如 06:22:562/24 或一行多个时间戳)
-        timestamp_pattern = r"\[\d{1,2}/\d{1,2}\s+\d{2}:\d{2}:\d{2}\]"
-        timestamps = re.findall(timestamp_pattern, line)
-        if len(timestamps) > 1:
-            problems.append(
-                ("DUPLICATE_TIMESTAMP", f"一行中有{len(timestamps)}个时间戳")
-            )
+        # 每个时间戳含两个冒号，至少 4 个冒号才可能有多个时间戳
+        if colon_count >= 4:
+            timestamps = _RE_TIMESTAMP.findall(line)
+            if len(timestamps) > 1:
+                problems.append(
+                    ("DUPLICATE_TIMESTAMP", f"一行中有{len(timestamps)}个时间戳")
+                )
 
         # 检测损坏的时间戳 (秒数超过2位)
-        broken_ts = re.search(r"\d{2}:\d{2}:\d{3,}", line)
+        broken_ts = _RE_BROKEN_TIMESTAMP.search(line) if colon_count >= 2 else None
         if broken_ts:
-            problems.append(("CORRUPTED_TIMESTAMP", f"时间戳损坏: {broken_ts.group()}"))
+            problems.append(
+                ("CORRUPTED_TIMESTAMP", f"时间戳损坏: {_decode(broken_ts.group())}")
+            )
 
         # 2. 检测行合并 (一行中出现多个 [ap] 标签)
-        ap_count = len(re.findall(r"\[ap\]", line, re.IGNORECASE))
+        ap_count = len(_RE_AP_TAG.findall(line)) if line.count(b"[") > 1 else 0
         if ap_count > 1:
             problems.append(("LINE_MERGED", f"检测到{ap_count}个[ap]标签，多行被合并"))
 
         # 3. 检测标签格式异常 (如 [51][ap] 缺少空格)
-        if re.search(r"\]\[ap\]", line, re.IGNORECASE):
+        if b"][" in line and _RE_TAG_MALFORMED.search(line):
             problems.append(("TAG_MALFORMED", "[ap]标签格式异常"))
 
         # 4. 检测数据与标签混合 (如 0x42AC0000[ap] 或 0x42AC0000[12/24)
         # 排除正常的寄存器地址格式 [0x450] 或 0x450]
-        hex_with_tag = re.search(r"0x[0-9A-Fa-f]{8}\[(?!0x)", line)
+        hex_with_tag = _RE_HEX_WITH_TAG.search(line) if hex_count else None
         if hex_with_tag:
             problems.append(
-                ("DATA_TAG_MIXED", f"数据与标签混合: {hex_with_tag.group()}")
+                ("DATA_TAG_MIXED", f"数据与标签混合: {_decode(hex_with_tag.group())}")
             )
 
         # 5. 检测连续十六进制数无空格 (如 0x300100000x30010A02)
-        continuous_hex = re.search(r"0x[0-9A-Fa-f]{8}0x[0-9A-Fa-f]", line)
+        continuous_hex = _RE_CONTINUOUS_HEX.search(line) if hex_count > 1 else None
         if continuous_hex:
             problems.append(
-                ("DATA_NO_SEPARATOR", f"数据无分隔符: {continuous_hex.group()}")
+                (
+                    "DATA_NO_SEPARATOR",
+                    f"数据无分隔符: {_decode(continuous_hex.group())}",
+                )
             )
 
         # 6. 检测一行中有多对命令 (正常每行最多1对)
-        hex_pairs = re.findall(r"0x[0-9A-Fa-f]{8}\s+0x[0-9A-Fa-f]{8}", line)
-        if len(hex_pairs) > 1:
-            problems.append(("MULTIPLE_COMMANDS", f"一行有{len(hex_pairs)}对命令"))
+        if hex_count >= 4:
+            hex_pairs = _RE_HEX_PAIR.findall(line)
+            if len(hex_pairs) > 1:
+                problems.append(("MULTIPLE_COMMANDS", f"一行有{len(hex_pairs)}对命令"))
 
         # 7. 检测数据截断 (行尾有孤立的短数字)
-        if re.search(r"\s+\d{1,3}$", line) and not re.search(r"0x[0-9A-Fa-f]+$", line):
-            if not re.search(r"\[\d+\]\s*=", line):  # 排除寄存器索引
-                trailing = re.search(r"\s+(\d{1,3})$", line)
+        if (
+            line[-1:].isdigit()
+            and _RE_TRAILING_NUM.search(line)
+            and not _RE_TRAILING_HEX.search(line)
+        ):
+            if not _RE_REG_INDEX.search(line):  # 排除寄存器索引
+                trailing = _RE_TRAILING_NUM.search(line)
                 if trailing:
                     problems.append(
-                        ("DATA_TRUNCATED", f"数据可能被截断: '{trailing.group(1)}'")
+                        (
+                            "DATA_TRUNCATED",
+                            f"数据可能被截断: '{_decode(trailing.group(1))}'",
+                        )
                     )
 
         if problems:
             issue_types = [p[0] for p in problems]
             descriptions = [p[1] for p in problems]
+            stripped = _decode(line.strip())
             issue = LogIntegrityIssue(
                 line_number=line_number,
-                original_line=line.strip()[:80]
-                + ("..." if len(line.strip()) > 80 else ""),
+                original_line=stripped[:80] + ("..." if len(stripped) > 80 else ""),
                 issue_type=", ".join(issue_types),
                 description="; ".join(descriptions),
             )
@@ -98,11 +165,25 @@ class LogIntegrityChecker:
 
         return None
 
-    def analyze(self, lines: List[str]) -> List[LogIntegrityIssue]:
-        """分析整个文件"""
+    def analyze(self, lines: Iterable[Union[bytes, str]]) -> List[LogIntegrityIssue]:
+        """分析整个文件
+
+        Args:
+            lines: 日志行，推荐直接传入 bytes 行 (如以 "rb" 打开的文件对象)
+        """
         self.issues = []
-        for i, line in enumerate(lines, 1):
-            self.check_line(i, line)
+        self._line_number = 0
+        for line in lines:
+            self.analyze_line(line)
+        return self.finalize()
+
+    def analyze_line(self, line: Union[bytes, str]):
+        """逐行推入日志，行号自动递增 (用于与其他解析器共用一次遍历)"""
+        self._line_number += 1
+        self.check_line(self._line_number, line)
+
+    def finalize(self) -> List[LogIntegrityIssue]:
+        """结束逐行检测，返回发现的问题"""
         return self.issues
 
     def print_report(self, console: Console):
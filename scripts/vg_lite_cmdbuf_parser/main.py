@@ -12,51 +12,368 @@ VGLite 命令缓冲区解析器
   python main.py -f dump.log --no-parse-path   # 禁用路径解析
   python main.py -f dump.log --no-parse-image  # 禁用图片分析
   python main.py -f dump.log -c           # 检测日志完整性
+  python main.py -f dump.log --no-cache   # 不使用解析结果缓存
+  python main.py -f dump.log --plain      # 命令表格输出为纯文本 (超大日志更快)
+  python main.py --batch a.log b.log      # 依次解析多个日志文件
   python main.py -i                       # 交互模式
 """
 
 import argparse
+import contextlib
+import functools
+import importlib
+import itertools
+import mmap
+import queue
 import sys
 import os
-from typing import List
-
-from rich.console import Console
-
-# 支持直接运行和作为包导入两种方式
-try:
-    from .constants import (
-        REGISTER_MAP,
-        BLEND_MODES,
-        IMAGE_FORMATS,
-    )
-    from .models import ParsedCommand
-    from .integrity import LogIntegrityChecker
-    from .command_parser import VGLiteCommandParser
-    from .register_analyzer import GPURegisterAnalyzer
-    from .output import (
-        create_command_table,
-        add_command_to_table,
-        print_summary,
-    )
-    from .coredump_parser import parse_coredump
-    from .svg_exporter import SVGExporter
-except ImportError:
-    from constants import (
-        REGISTER_MAP,
-        BLEND_MODES,
-        IMAGE_FORMATS,
-    )
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ContextManager,
+    Iterable,
+    Iterator,
+    List,
+    Union,
+)
+
+# 各功能模块在实际用到时才导入，--help 等轻量路径不必加载 Rich 和各解析器
+if TYPE_CHECKING:
+    from rich.console import Console
     from models import ParsedCommand
-    from integrity import LogIntegrityChecker
     from command_parser import VGLiteCommandParser
-    from register_analyzer import GPURegisterAnalyzer
-    from output import (
-        create_command_table,
-        add_command_to_table,
-        print_summary,
+
+
+def _import_sibling(name: str):
+    """按需导入同级模块，支持直接运行和作为包导入两种方式"""
+    if __package__:
+        return importlib.import_module(f".{name}", __package__)
+    return importlib.import_module(name)
+
+
+# 并行分发时每批行数和每个分析器的待处理批次上限
+_PARALLEL_BATCH_LINES = 4096
+_PARALLEL_QUEUE_DEPTH = 8
+
+# 无法内存映射时逐行读取日志所用的缓冲区大小 (默认 8 KiB 对大文件偏小)
+_LOG_READ_BUFFER = 1 << 20
+
+# 正则预热只需执行一次
+_WARMED = False
+
+# 所有输出共用一个 Console，避免重复探测终端
+_CONSOLE = None
+
+
+def _get_console() -> "Console":
+    global _CONSOLE
+    if _CONSOLE is None:
+        from rich.console import Console
+
+        _CONSOLE = Console()
+    return _CONSOLE
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_parser(
+    verbose: bool, parse_path: bool, parse_image: bool
+) -> "VGLiteCommandParser":
+    VGLiteCommandParser = _import_sibling("command_parser").VGLiteCommandParser
+    return VGLiteCommandParser(
+        verbose=verbose, parse_path=parse_path, parse_image=parse_image
     )
-    from coredump_parser import parse_coredump
-    from svg_exporter import SVGExporter
+
+
+def _get_parser(
+    verbose: bool = False, parse_path: bool = False, parse_image: bool = False
+) -> "VGLiteCommandParser":
+    """按配置复用解析器实例，每次返回前重置状态"""
+    parser = _cached_parser(verbose, parse_path, parse_image)
+    parser.reset()
+    return parser
+
+
+def _format_groups(
+    groups: List[List["ParsedCommand"]],
+    format_row: Callable,
+) -> list:
+    """格式化各段的表格行
+
+    自由线程解释器上各段并行格式化 (段之间互不依赖)，否则顺序执行
+    """
+
+    def format_group(cmds):
+        return [format_row(cmd) for cmd in cmds]
+
+    if len(groups) > 1 and _gil_disabled():
+        workers = min(len(groups), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(format_group, groups))
+    return [format_group(cmds) for cmds in groups]
+
+
+def _render_sections(
+    parser: "VGLiteCommandParser",
+    commands: List["ParsedCommand"],
+    console: "Console",
+    plain: bool = False,
+):
+    """按段构建命令表格，合并为一个 Group 一次性输出
+
+    plain 为 True 或输出不是终端时，改为写制表符分隔的纯文本
+    """
+    from rich.console import Group, NewLine
+
+    output = _import_sibling("output")
+
+    if parser.command_sections:
+        sections = [
+            (f"【{section['name']}】", section["address"], section["size"])
+            for section in parser.command_sections
+        ]
+        groups = [section["commands"] for section in parser.command_sections]
+    else:
+        # 兼容无段落的日志
+        sections = [("VGLite 命令缓冲区解析结果", None, None)]
+        groups = [commands]
+    all_rows = _format_groups(groups, output.make_row_formatter(parser))
+
+    # 指定纯文本输出或输出被重定向到文件/管道时，跳过 Rich 排版
+    if plain or not console.is_terminal:
+        for (title, address, size), rows in zip(sections, all_rows):
+            output.write_command_rows_plain(console.file, title, rows, address, size)
+        return
+
+    if not parser.command_sections:
+        title, _, _ = sections[0]
+        console.print(output.create_command_table_bulk(title, all_rows[0]))
+        return
+
+    renderables = []
+    for (title, address, size), rows in zip(sections, all_rows):
+        renderables.append(output.create_command_table_bulk(title, rows, address, size))
+        renderables.append(NewLine())
+    console.print(Group(*renderables))
+
+
+@contextlib.contextmanager
+def _map_log_file(filename: str) -> Iterator[Iterable[bytes]]:
+    """以内存映射方式打开日志文件，按需逐行产出 bytes，不整体读入内存"""
+    with open(filename, "rb", buffering=_LOG_READ_BUFFER) as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # 空文件或不支持映射的文件 (如管道) 退回普通逐行读取
+            yield f
+            return
+        with mm:
+            if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                # 顺序读取提示，让内核提前预读，减少缺页
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            yield iter(mm.readline, b"")
+
+
+def _gil_disabled() -> bool:
+    """是否运行在关闭 GIL 的自由线程解释器上 (Python 3.13t+)"""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _drain_batches(q: queue.Queue, consume: Callable):
+    """消费线程: 按顺序处理行批次直到收到 None"""
+    error = None
+    while True:
+        batch = q.get()
+        if batch is None:
+            break
+        # 出错后继续取走批次，避免生产者阻塞在已满的队列上
+        if error is None:
+            try:
+                for line in batch:
+                    consume(line)
+            except BaseException as e:
+                error = e
+    if error is not None:
+        raise error
+
+
+def _decode_line(raw: Union[bytes, str]) -> str:
+    if isinstance(raw, bytes):
+        return raw.decode("utf-8", errors="ignore")
+    return raw
+
+
+def _feed_parallel(
+    raw_lines: Iterable[Union[bytes, str]],
+    byte_consumers: List[Callable],
+    text_consumers: List[Callable],
+):
+    """
+    将日志行按批次分发给多个分析器线程并行处理
+
+    各分析器互不依赖，每个分析器在独立线程中按原顺序收到全部行。
+    只有关闭 GIL 时才有收益，否则直接在单线程中逐行推送。
+    """
+    consumers = [(fn, False) for fn in byte_consumers] + [
+        (fn, True) for fn in text_consumers
+    ]
+    queues = [queue.Queue(maxsize=_PARALLEL_QUEUE_DEPTH) for _ in consumers]
+    raw_iter = iter(raw_lines)
+
+    with ThreadPoolExecutor(max_workers=len(consumers)) as executor:
+        futures = [
+            executor.submit(_drain_batches, q, fn)
+            for q, (fn, _) in zip(queues, consumers)
+        ]
+        try:
+            while True:
+                raw_batch = list(itertools.islice(raw_iter, _PARALLEL_BATCH_LINES))
+                if not raw_batch:
+                    break
+                text_batch = [_decode_line(raw) for raw in raw_batch]
+                for q, (_, wants_text) in zip(queues, consumers):
+                    q.put(text_batch if wants_text else raw_batch)
+        finally:
+            for q in queues:
+                q.put(None)
+        for future in futures:
+            future.result()
+
+
+def _parse_core(
+    log_source: ContextManager[Iterable[Union[bytes, str]]],
+    *,
+    verbose: bool = False,
+    parse_path: bool = False,
+    parse_image: bool = False,
+    check_integrity: bool = False,
+    with_registers: bool = False,
+    cache_file: str = None,
+    plain_output: bool = False,
+) -> List["ParsedCommand"]:
+    """
+    解析流程的统一实现: 完整性检测 -> 寄存器分析 -> 命令解析 -> 输出
+
+    输入只遍历一次，每行依次推给各个分析器；输入在输出阶段之前就已关闭释放
+
+    Args:
+        log_source: 产出日志行的上下文管理器，文件输入为 bytes 行
+            (见 _map_log_file)，字符串输入可直接产出 str 行
+        verbose: 是否显示详细信息
+        parse_path: 是否解析路径数据
+        parse_image: 是否分析图片绘制
+        check_integrity: 是否检测日志完整性
+        with_registers: 是否分析寄存器
+        cache_file: 日志文件路径，给定时按文件指纹缓存解析结果 (None 不使用缓存)
+        plain_output: 命令表格输出为纯文本 (汇总仍使用 Rich 表格)
+
+    Returns:
+        解析后的命令列表
+    """
+    console = _get_console()
+    parser = _get_parser(verbose, parse_path, parse_image)
+    checker = None
+    if check_integrity:
+        checker = _import_sibling("integrity").LogIntegrityChecker()
+    reg_analyzer = None
+    if with_registers:
+        reg_analyzer = _import_sibling("register_analyzer").GPURegisterAnalyzer()
+
+    cache = None
+    cache_key = None
+    if cache_file:
+        cache = _import_sibling("_cache")
+        cache_key = cache.make_key(
+            cache_file,
+            parse_path=parse_path,
+            parse_image=parse_image,
+            check_integrity=check_integrity,
+            with_registers=with_registers,
+            module=type(parser).__module__,
+        )
+
+    cached = cache.load(cache_key) if cache_key else None
+    if cached is not None:
+        # 命中缓存: 直接恢复各分析器的结果，不再打开日志
+        _restore_results(cached, parser, checker, reg_analyzer)
+        commands = parser.commands
+    else:
+        commands = _feed_analyzers(log_source, parser, checker, reg_analyzer)
+        if cache_key:
+            cache.save(cache_key, _snapshot_results(parser, checker, reg_analyzer))
+    del log_source
+
+    if checker:
+        checker.print_report(console)
+
+    if reg_analyzer:
+        reg_analyzer.analyze(console)
+
+    _render_sections(parser, commands, console, plain=plain_output)
+    _import_sibling("output").print_summary(parser, console)
+
+    return commands
+
+
+# 解析器中属于配置而非解析结果的属性，不写入缓存
+_PARSER_CONFIG_ATTRS = ("verbose", "parse_path", "parse_image")
+
+
+def _snapshot_results(parser, checker, reg_analyzer) -> dict:
+    """收集各分析器的解析结果，用于写入缓存"""
+    return {
+        "parser": {
+            name: value
+            for name, value in vars(parser).items()
+            if name not in _PARSER_CONFIG_ATTRS
+        },
+        "issues": checker.issues if checker else None,
+        "registers": (
+            (reg_analyzer.registers, reg_analyzer.register_arrays)
+            if reg_analyzer
+            else None
+        ),
+    }
+
+
+def _restore_results(cached: dict, parser, checker, reg_analyzer):
+    """将缓存的解析结果恢复到各分析器"""
+    vars(parser).update(cached["parser"])
+    if checker:
+        checker.issues = cached["issues"]
+    if reg_analyzer:
+        reg_analyzer.registers, reg_analyzer.register_arrays = cached["registers"]
+
+
+def _feed_analyzers(log_source, parser, checker, reg_analyzer) -> List["ParsedCommand"]:
+    """遍历一次输入，把每行推给各个分析器，返回解析后的命令列表"""
+    parser.begin()
+    with log_source as raw_lines:
+        if _gil_disabled() and (checker or reg_analyzer):
+            # 寄存器分析在命令解析之前接收每一行，与单线程路径的顺序一致
+            text_consumers = [parser.feed_line]
+            if reg_analyzer:
+                text_consumers.insert(0, reg_analyzer.feed_line)
+            _feed_parallel(
+                raw_lines,
+                byte_consumers=[checker.analyze_line] if checker else [],
+                text_consumers=text_consumers,
+            )
+        else:
+            for raw in raw_lines:
+                # 完整性检测直接按字节匹配
+                if checker:
+                    checker.analyze_line(raw)
+                line = _decode_line(raw)
+                if reg_analyzer:
+                    reg_analyzer.feed_line(line)
+                parser.feed_line(line)
+    # 输入已消费完毕: 文件映射已解除，丢掉剩余引用，输出阶段只保留解析结果
+    del log_source, raw_lines
+    if checker:
+        checker.finalize()
+    return parser.finalize()
 
 
 def parse_file_v2(
@@ -68,7 +385,9 @@ def parse_file_v2(
     export_html: str = None,
     canvas_width: int = 466,
     canvas_height: int = 466,
-) -> List[ParsedCommand]:
+    use_cache: bool = False,
+    plain_output: bool = False,
+) -> List["ParsedCommand"]:
     """
     从文件解析日志 (v2版本，使用Rich表格输出)
 
@@ -78,91 +397,91 @@ def parse_file_v2(
         parse_path: 是否解析路径数据
         check_integrity: 是否检测日志完整性
         parse_image: 是否分析图片绘制
+        export_html: 保留参数，HTML/SVG 导出目前仅用于 coredump 模式
+        canvas_width: 保留参数
+        canvas_height: 保留参数
+        use_cache: 是否使用磁盘缓存的解析结果
+        plain_output: 命令表格输出为纯文本
 
     Returns:
         解析后的命令列表
     """
-    with open(filename, "r", encoding="utf-8", errors="ignore") as f:
-        log_text = f.read()
+    return _parse_core(
+        _map_log_file(filename),
+        verbose=verbose,
+        parse_path=parse_path,
+        parse_image=parse_image,
+        check_integrity=check_integrity,
+        cache_file=filename if use_cache else None,
+        plain_output=plain_output,
+    )
 
-    console = Console()
 
-    # 日志完整性检测
-    if check_integrity:
-        lines = log_text.splitlines()
-        checker = LogIntegrityChecker()
-        checker.analyze(lines)
-        checker.print_report(console)
+def _prefetch_file(filename: str):
+    """让内核提前把文件读入页缓存 (在后台线程调用，失败时忽略)"""
+    try:
+        with open(filename, "rb") as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            else:
+                # 不支持 fadvise 的平台直接读一遍
+                while f.read(_LOG_READ_BUFFER):
+                    pass
+    except OSError:
+        pass
 
-    # 解析命令缓冲区
-    parser = VGLiteCommandParser(
-        verbose=verbose, parse_path=parse_path, parse_image=parse_image
-    )
-    commands = parser.parse_log(log_text)
 
-    # 按段输出
-    if parser.command_sections:
-        for section in parser.command_sections:
-            table = create_command_table(
-                f"【{section['name']}】", section["address"], section["size"]
-            )
+def parse_files_batch(
+    filenames: List[str], with_registers: bool = False, **kwargs
+) -> List[List["ParsedCommand"]]:
+    """
+    依次解析多个日志文件，按输入顺序输出
 
-            for cmd in section["commands"]:
-                add_command_to_table(table, cmd, parser)
+    解析当前文件的同时在后台预读下一个文件，文件读取与解析重叠
 
-            console.print(table)
-            console.print()
-    else:
-        # 兼容无段落的日志
-        table = create_command_table("VGLite 命令缓冲区解析结果")
-        for cmd in commands:
-            add_command_to_table(table, cmd, parser)
-        console.print(table)
+    Args:
+        filenames: 日志文件路径列表
+        with_registers: 是否包含寄存器分析
+        kwargs: 传给 parse_file_v2 / parse_with_registers 的其余选项
 
-    print_summary(parser, console)
+    Returns:
+        每个文件解析后的命令列表
+    """
+    from rich.text import Text
 
-    return commands
+    parse = parse_with_registers if with_registers else parse_file_v2
+    console = _get_console()
+    results = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        for i, filename in enumerate(filenames):
+            if i + 1 < len(filenames):
+                executor.submit(_prefetch_file, filenames[i + 1])
+            console.rule(Text(filename, style="bold"))
+            results.append(parse(filename, **kwargs))
+    return results
 
 
 def parse_string_v2(
-    log_text: str, verbose: bool = False, parse_path: bool = False
-) -> List[ParsedCommand]:
+    log_text: Union[str, Iterable[str]],
+    verbose: bool = False,
+    parse_path: bool = False,
+) -> List["ParsedCommand"]:
     """
     从字符串解析日志
 
     Args:
-        log_text: 日志文本
+        log_text: 日志文本，或逐行的字符串序列 (无需先拼接成整段文本)
         verbose: 是否显示详细信息
         parse_path: 是否解析路径数据
 
     Returns:
         解析后的命令列表
     """
-    parser = VGLiteCommandParser(verbose=verbose, parse_path=parse_path)
-    commands = parser.parse_log(log_text)
-    console = Console()
-
-    # 按段输出
-    if parser.command_sections:
-        for section in parser.command_sections:
-            table = create_command_table(
-                f"【{section['name']}】", section["address"], section["size"]
-            )
-
-            for cmd in section["commands"]:
-                add_command_to_table(table, cmd, parser)
-
-            console.print(table)
-            console.print()
-    else:
-        # 兼容无段落的日志
-        table = create_command_table("VGLite 命令缓冲区解析结果")
-        for cmd in commands:
-            add_command_to_table(table, cmd, parser)
-        console.print(table)
-
-    print_summary(parser, console)
-    return commands
+    if isinstance(log_text, str):
+        log_text = log_text.strip().split("\n")
+    return _parse_core(
+        contextlib.nullcontext(log_text), verbose=verbose, parse_path=parse_path
+    )
 
 
 def parse_with_registers(
@@ -171,7 +490,9 @@ def parse_with_registers(
     parse_path: bool = False,
     check_integrity: bool = False,
     parse_image: bool = False,
-) -> List[ParsedCommand]:
+    use_cache: bool = False,
+    plain_output: bool = False,
+) -> List["ParsedCommand"]:
     """
     解析日志文件，包括寄存器分析和命令缓冲区解析
 
@@ -181,55 +502,22 @@ def parse_with_registers(
         parse_path: 是否解析路径数据
         check_integrity: 是否检测日志完整性
         parse_image: 是否分析图片绘制
+        use_cache: 是否使用磁盘缓存的解析结果
+        plain_output: 命令表格输出为纯文本
 
     Returns:
         解析后的命令列表
     """
-    with open(filename, "r", encoding="utf-8", errors="ignore") as f:
-        log_text = f.read()
-
-    console = Console()
-
-    # 日志完整性检测
-    if check_integrity:
-        lines = log_text.splitlines()
-        checker = LogIntegrityChecker()
-        checker.analyze(lines)
-        checker.print_report(console)
-
-    # 先分析寄存器
-    reg_analyzer = GPURegisterAnalyzer()
-    reg_analyzer.parse_registers(log_text)
-    reg_analyzer.analyze(console)
-
-    # 再解析命令缓冲区
-    parser = VGLiteCommandParser(
-        verbose=verbose, parse_path=parse_path, parse_image=parse_image
+    return _parse_core(
+        _map_log_file(filename),
+        verbose=verbose,
+        parse_path=parse_path,
+        parse_image=parse_image,
+        check_integrity=check_integrity,
+        with_registers=True,
+        cache_file=filename if use_cache else None,
+        plain_output=plain_output,
     )
-    commands = parser.parse_log(log_text)
-
-    # 按段输出
-    if parser.command_sections:
-        for section in parser.command_sections:
-            table = create_command_table(
-                f"【{section['name']}】", section["address"], section["size"]
-            )
-
-            for cmd in section["commands"]:
-                add_command_to_table(table, cmd, parser)
-
-            console.print(table)
-            console.print()
-    else:
-        # 兼容无段落的日志
-        table = create_command_table("VGLite 命令缓冲区解析结果")
-        for cmd in commands:
-            add_command_to_table(table, cmd, parser)
-        console.print(table)
-
-    print_summary(parser, console)
-
-    return commands
 
 
 def interactive_mode(verbose: bool = False, parse_path: bool = False):
@@ -255,12 +543,158 @@ def interactive_mode(verbose: bool = False, parse_path: bool = False):
             break
 
     if lines:
-        log_text = "\n".join(lines)
-        parse_string_v2(log_text, verbose, parse_path)
+        parse_string_v2(lines, verbose, parse_path)
     else:
         print("没有输入内容")
 
 
+def _normalize_args(args: argparse.Namespace) -> dict:
+    """将命令行参数整理为各运行模式共用的选项字典"""
+    return {
+        "file": args.file,
+        "batch": args.batch,
+        "string": args.string,
+        "interactive": args.interactive,
+        "elf": args.elf,
+        "core": args.core,
+        "regs": args.regs,
+        "verbose": args.verbose,
+        # 默认开启的选项
+        "parse_path": not args.no_parse_path,
+        "parse_image": not args.no_parse_image,
+        "check_integrity": args.check_integrity,
+        # 未指定时使用 backup_command_buffer
+        "cmdbuf_index": args.cmdbuf if args.cmdbuf is not None else -1,
+        "export_html": args.export_html,
+        "canvas_width": args.canvas_width,
+        "canvas_height": args.canvas_height,
+        "use_cache": not args.no_cache,
+        "plain_output": args.plain,
+    }
+
+
+def _run_coredump(opts: dict):
+    """Coredump 解析模式"""
+    parse_coredump = _import_sibling("coredump_parser").parse_coredump
+
+    commands, target_info, context_state = parse_coredump(
+        elf_path=opts["elf"],
+        core_path=opts["core"],
+        verbose=opts["verbose"],
+        parse_path=opts["parse_path"],
+        cmdbuf_index=opts["cmdbuf_index"],
+    )
+
+    # HTML/SVG 导出
+    export_html = opts["export_html"]
+    if not export_html:
+        return
+
+    console = _get_console()
+    if not commands:
+        console.print(f"[yellow]警告: 没有解析到任何命令，无法导出 HTML 文件[/yellow]")
+        return
+
+    # 使用 target buffer 的尺寸（如果可用）
+    canvas_width = opts["canvas_width"]
+    canvas_height = opts["canvas_height"]
+    if target_info:
+        if target_info.width > 0:
+            canvas_width = target_info.width
+        if target_info.height > 0:
+            canvas_height = target_info.height
+
+    SVGExporter = _import_sibling("svg_exporter").SVGExporter
+    exporter = SVGExporter(
+        width=canvas_width,
+        height=canvas_height,
+    )
+    exporter.set_target_info(target_info)
+    exporter.set_context_state(context_state)
+    exporter.process_commands(commands)
+    try:
+        if export_html.endswith(".svg"):
+            exporter.export_svg(export_html)
+        else:
+            exporter.export_html(export_html)
+        console.print(f"[green]已导出可视化文件: {export_html}[/green]")
+    except Exception as e:
+        console.print(f"[red]错误: 导出 HTML 文件失败: {e}[/red]")
+
+
+def _run_file_with_registers(opts: dict):
+    parse_with_registers(
+        opts["file"],
+        opts["verbose"],
+        opts["parse_path"],
+        opts["check_integrity"],
+        opts["parse_image"],
+        use_cache=opts["use_cache"],
+        plain_output=opts["plain_output"],
+    )
+
+
+def _run_file(opts: dict):
+    parse_file_v2(
+        opts["file"],
+        opts["verbose"],
+        opts["parse_path"],
+        opts["check_integrity"],
+        opts["parse_image"],
+        opts["export_html"],
+        opts["canvas_width"],
+        opts["canvas_height"],
+        use_cache=opts["use_cache"],
+        plain_output=opts["plain_output"],
+    )
+
+
+def _run_batch(opts: dict):
+    parse_files_batch(
+        opts["batch"],
+        with_registers=opts["regs"],
+        verbose=opts["verbose"],
+        parse_path=opts["parse_path"],
+        check_integrity=opts["check_integrity"],
+        parse_image=opts["parse_image"],
+        use_cache=opts["use_cache"],
+        plain_output=opts["plain_output"],
+    )
+
+
+def _run_string(opts: dict):
+    parse_string_v2(opts["string"], opts["verbose"], opts["parse_path"])
+
+
+def _run_interactive(opts: dict):
+    interactive_mode(opts["verbose"], opts["parse_path"])
+
+
+# 运行模式分派表: 所需选项 -> 处理函数，按顺序匹配
+_DISPATCH = {
+    ("elf", "core"): _run_coredump,
+    ("batch",): _run_batch,
+    ("file", "regs"): _run_file_with_registers,
+    ("file",): _run_file,
+    ("string",): _run_string,
+    ("interactive",): _run_interactive,
+}
+
+
+def _warmup(opts: dict):
+    """在分派之前预编译本次运行会用到的正则，避免计入首次解析 (只执行一次)"""
+    global _WARMED
+    if _WARMED:
+        return
+    _WARMED = True
+
+    _import_sibling("command_parser").VGLiteCommandParser.precompile()
+    if opts["check_integrity"]:
+        _import_sibling("integrity").LogIntegrityChecker.precompile()
+    if opts["regs"]:
+        _import_sibling("register_analyzer").GPURegisterAnalyzer.precompile()
+
+
 def main():
     """主函数"""
     arg_parser = argparse.ArgumentParser(
@@ -292,6 +726,9 @@ def main():
   # 从 coredump 解析命令缓冲区
   python main.py --elf firmware.elf --core crash.core
 
+  # 批量解析多个日志文件
+  python main.py --batch a.log b.log c.log
+
   # 交互模式
   python main.py -i
 
@@ -301,6 +738,12 @@ def main():
     )
 
     arg_parser.add_argument("-f", "--file", help="日志文件路径")
+    arg_parser.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="FILE",
+        help="依次解析多个日志文件 (后台预读下一个文件)",
+    )
     arg_parser.add_argument("-s", "--string", help="直接解析命令字符串")
     arg_parser.add_argument(
         "-i", "--interactive", action="store_true", help="交互模式,从标准输入读取"
@@ -328,6 +771,16 @@ def main():
         action="store_true",
         help="禁用图片绘制分析 (默认开启)",
     )
+    arg_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="不使用解析结果缓存 (默认按文件内容缓存到 ~/.cache/vg_lite_cmdbuf_parser)",
+    )
+    arg_parser.add_argument(
+        "--plain",
+        action="store_true",
+        help="命令表格输出为制表符分隔的纯文本 (跳过 Rich 排版，适合超大日志)",
+    )
     arg_parser.add_argument(
         "--elf",
         help="ELF 文件路径 (用于 coredump 解析)",
@@ -365,83 +818,16 @@ def main():
     )
 
     args = arg_parser.parse_args()
+    opts = _normalize_args(args)
+    _warmup(opts)
 
-    # 处理默认开启的选项
-    parse_path = not args.no_parse_path
-    parse_image = not args.no_parse_image
-
-    # Coredump 解析模式
-    if args.elf and args.core:
-        # 确定要分析的 command buffer 索引
-        cmdbuf_index = args.cmdbuf if args.cmdbuf is not None else -1
-
-        commands, target_info, context_state = parse_coredump(
-            elf_path=args.elf,
-            core_path=args.core,
-            verbose=args.verbose,
-            parse_path=parse_path,
-            cmdbuf_index=cmdbuf_index,
-        )
-
-        # HTML/SVG 导出
-        if args.export_html:
-            if not commands:
-                console = Console()
-                console.print(f"[yellow]警告: 没有解析到任何命令，无法导出 HTML 文件[/yellow]")
-            else:
-                # 使用 target buffer 的尺寸（如果可用）
-                canvas_width = args.canvas_width
-                canvas_height = args.canvas_height
-                if target_info:
-                    if target_info.width > 0:
-                        canvas_width = target_info.width
-                    if target_info.height > 0:
-                        canvas_height = target_info.height
-
-                exporter = SVGExporter(
-                    width=canvas_width,
-                    height=canvas_height,
-                )
-                exporter.set_target_info(target_info)
-                exporter.set_context_state(context_state)
-                exporter.process_commands(commands)
-                try:
-                    if args.export_html.endswith(".svg"):
-                        exporter.export_svg(args.export_html)
-                    else:
-                        exporter.export_html(args.export_html)
-                    console = Console()
-                    console.print(f"[green]已导出可视化文件: {args.export_html}[/green]")
-                except Exception as e:
-                    console = Console()
-                    console.print(f"[red]错误: 导出 HTML 文件失败: {e}[/red]")
-    elif args.file:
-        if args.regs:
-            parse_with_registers(
-                args.file,
-                args.verbose,
-                parse_path,
-                args.check_integrity,
-                parse_image,
-            )
-        else:
-            parse_file_v2(
-                args.file,
-                args.verbose,
-                parse_path,
-                args.check_integrity,
-                parse_image,
-                args.export_html,
-                args.canvas_width,
-                args.canvas_height,
-            )
-    elif args.string:
-        parse_string_v2(args.string, args.verbose, parse_path)
-    elif args.interactive:
-        interactive_mode(args.verbose, parse_path)
+    # 按优先级选择第一个参数齐备的运行模式，默认交互模式
+    for keys, handler in _DISPATCH.items():
+        if all(opts[key] for key in keys):
+            handler(opts)
+            break
     else:
-        # 默认交互模式
-        interactive_mode(args.verbose, parse_path)
+        _run_interactive(opts)
 
 
 if __name__ == "__main__":
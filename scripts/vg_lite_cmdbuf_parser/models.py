@@ -6,11 +6,17 @@ VGLite 数据模型
 包含解析过程中使用的数据类定义
 """
 
+import sys
 from dataclasses import dataclass, field
 from typing import List, Tuple, Optional
 
+# Python 3.10+ 使用 __slots__，减少大量命令/路径段实例的内存和属性访问开销
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+_IDENTITY_MATRIX = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)
+
+
+@dataclass(**_SLOTS)
 class LogIntegrityIssue:
     """日志完整性问题"""
 
@@ -20,7 +26,7 @@ class LogIntegrityIssue:
     description: str  # 问题描述
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ImageDrawInfo:
     """图片绘制信息"""
 
@@ -40,8 +46,8 @@ class ImageDrawInfo:
     dst_height: int = 0
     dst_stride: int = 0
 
-    # 变换矩阵
-    matrix: List[float] = None
+    # 变换矩阵 (解析完成后不再修改，使用不可变的 tuple)
+    matrix: Tuple[float, ...] = _IDENTITY_MATRIX
 
     # 混合模式
     blend_mode: str = "SRC_OVER"
@@ -56,17 +62,25 @@ class ImageDrawInfo:
     offset: int = 0
     section_name: str = ""
 
-    def __post_init__(self):
-        if self.matrix is None:
-            self.matrix = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0]
+    # 矩阵分类结果缓存: (计算时的 matrix 对象, 字符串表示)
+    _matrix_str: Optional[Tuple[Tuple[float, ...], str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def get_matrix_str(self) -> str:
-        """获取矩阵的字符串表示"""
+        """获取矩阵的字符串表示 (首次调用时分类并缓存)"""
+        cached = self._matrix_str
+        if cached is None or cached[0] is not self.matrix:
+            cached = self._matrix_str = (self.matrix, self._format_matrix())
+        return cached[1]
+
+    def _format_matrix(self) -> str:
         if not self.matrix:
             return "Identity"
         # 检查是否为单位矩阵
-        identity = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0]
-        is_identity = all(abs(a - b) < 0.0001 for a, b in zip(self.matrix, identity))
+        is_identity = all(
+            abs(a - b) < 0.0001 for a, b in zip(self.matrix, _IDENTITY_MATRIX)
+        )
         if is_identity:
             return "Identity"
         # 检查是否为平移矩阵
@@ -98,22 +112,25 @@ class ImageDrawInfo:
         return 0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PathSegment:
     """路径段"""
 
     opcode: int
     op_name: str
     coords: List[float]
+    # 格式化结果缓存，表格每次渲染都会调用 str(seg)
+    _str: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     def __str__(self):
-        if self.coords:
-            coord_str = ",".join(f"{c:.2f}" for c in self.coords)
-            return f"{self.op_name},{coord_str},"
-        return f"{self.op_name},"
+        if self._str is None:
+            # 所有坐标用一次 % 格式化完成，不逐个调用格式化
+            coords = self.coords
+            self._str = f"{self.op_name}," + ("%.2f," * len(coords)) % tuple(coords)
+        return self._str
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ParsedCommand:
     """解析后的命令"""
 
@@ -124,20 +141,16 @@ class ParsedCommand:
     description: str
     details: List[str]
     is_abnormal: bool = False  # 是否异常
-    abnormal_reasons: List[str] = None  # 异常原因
-    path_data: List[Tuple[int, int]] = None  # DATA命令的路径数据
-    path_segments: List[PathSegment] = None  # 解析后的路径段
-
-    def __post_init__(self):
-        if self.abnormal_reasons is None:
-            self.abnormal_reasons = []
-        if self.path_data is None:
-            self.path_data = []
-        if self.path_segments is None:
-            self.path_segments = []
+    abnormal_reasons: List[str] = field(default_factory=list)  # 异常原因
+    path_data: List[Tuple[int, int]] = field(default_factory=list)  # DATA命令的路径数据
+    path_segments: List[PathSegment] = field(default_factory=list)  # 解析后的路径段
+    # 表格描述列缓存: ((verbose, parse_path, parse_image), 描述文本)
+    _rendered: Optional[Tuple[tuple, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class CommandSection:
     """命令段"""
 
@@ -6,14 +6,27 @@ VGLite 输出格式化
 使用 Rich 库格式化输出命令解析结果
 """
 
+from collections import Counter
+
 from rich.console import Console
 from rich.table import Table
+from rich.text import Text
 
 try:
     from .models import ParsedCommand, ImageDrawInfo
 except ImportError:
     from models import ParsedCommand, ImageDrawInfo
-from typing import List, TYPE_CHECKING
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 if TYPE_CHECKING:
     try:
@@ -21,13 +34,17 @@ if TYPE_CHECKING:
     except ImportError:
         from command_parser import VGLiteCommandParser
 
+# 表格行: (单元格, 行样式)
+CommandRow = Tuple[Tuple[Union[Text, str], ...], Optional[str]]
+
 
 def create_command_table(title: str, address: str = None, size: str = None) -> Table:
     """创建命令表格"""
     table = Table(title=title, show_header=True, header_style="bold cyan")
-    table.add_column("偏移", style="dim", width=8, justify="right")
-    table.add_column("命令字", style="yellow", width=10)
-    table.add_column("数据字", style="yellow", width=10)
+    # 偏移和命令字/数据字为定长内容，不需要折行计算
+    table.add_column("偏移", style="dim", width=8, justify="right", no_wrap=True)
+    table.add_column("命令字", style="yellow", width=10, no_wrap=True)
+    table.add_column("数据字", style="yellow", width=10, no_wrap=True)
     table.add_column("类型", style="green", width=12)
     table.add_column("描述", style="white")
 
@@ -42,74 +59,167 @@ def create_command_table(title: str, address: str = None, size: str = None) -> T
     return table
 
 
+def create_command_table_bulk(
+    title: str,
+    rows: Iterable[CommandRow],
+    address: str = None,
+    size: str = None,
+) -> Table:
+    """创建命令表格并一次性填入预先格式化好的行"""
+    table = create_command_table(title, address, size)
+    add_row = table.add_row
+    for cells, style in rows:
+        # 绝大多数行没有样式，只给异常行传入 style
+        if style is None:
+            add_row(*cells)
+        else:
+            add_row(*cells, style=style)
+    return table
+
+
+def write_command_rows_plain(
+    file: TextIO,
+    title: str,
+    rows: Iterable[CommandRow],
+    address: str = None,
+    size: str = None,
+):
+    """以制表符分隔的纯文本输出命令表格 (输出不是终端时使用，跳过 Rich 排版)"""
+    out = [f"{title}\n"]
+    if address or size:
+        out.append(f"地址: {address or '-'}\t大小: {size or '-'}\n")
+    out.append("偏移\t命令字\t数据字\t类型\t描述\n")
+    for cells, _style in rows:
+        offset, cmd_word, data_word, cmd_type, desc = (str(c) for c in cells)
+        # 描述的附加行缩进到描述列下方
+        first, *rest = desc.split("\n")
+        out.append(f"{offset}\t{cmd_word}\t{data_word}\t{cmd_type}\t{first}\n")
+        for extra in rest:
+            out.append(f"\t\t\t\t{extra}\n")
+    out.append("\n")
+    file.write("".join(out))
+
+
 def add_command_to_table(
     table: Table, cmd: ParsedCommand, parser: "VGLiteCommandParser"
 ):
     """将命令添加到表格"""
-    # 异常命令使用红色
-    if cmd.is_abnormal:
-        style = "bold red"
-        offset = f"⚠️ {cmd.offset:04X}"
-    else:
-        style = None
-        offset = f"{cmd.offset:04X}"
+    cells, style = format_command_row(cmd, parser)
+    table.add_row(*cells, style=style)
 
-    # 构建描述
-    desc_parts = [cmd.description]
 
-    # 添加详情
-    if parser.verbose and cmd.details:
+def _describe_details(cmd: ParsedCommand, desc_parts: List[str]):
+    """添加详情"""
+    if cmd.details:
         for detail in cmd.details:
             desc_parts.append(f"  └─ {detail}")
 
-    # 添加路径段 (支持 DATA 和 CALL 命令)
-    if parser.parse_path and cmd.cmd_type in ("DATA", "CALL") and cmd.path_segments:
+
+def _describe_path(cmd: ParsedCommand, desc_parts: List[str]):
+    """添加路径段 (支持 DATA 和 CALL 命令)"""
+    if cmd.path_segments and cmd.cmd_type in ("DATA", "CALL"):
         desc_parts.append(f"  └─ 路径 ({len(cmd.path_segments)} 段):")
         for seg in cmd.path_segments:
             desc_parts.append(f"     {seg}")
 
-    # 图片绘制信息：在 DATA(1) 命令（矩形绘制）时显示当前图片信息
-    if parser.parse_image and cmd.cmd_type == "DATA":
-        data_count = cmd.cmd_word & 0x0FFFFFFF
-        if data_count == 1 and parser.image_draws:
-            # 找到对应这个偏移的图片绘制记录
-            for img in parser.image_draws:
-                if img.offset == cmd.offset:
-                    img_info = []
-                    if img.src_address:
-                        img_info.append(f"源: 0x{img.src_address:08X}")
-                    if img.src_format != "UNKNOWN":
-                        img_info.append(f"{img.src_format}")
-                    if img.src_width and img.src_height:
-                        img_info.append(f"{img.src_width}x{img.src_height}")
-                    if img.src_stride:
-                        img_info.append(f"步长:{img.src_stride}")
-                    mem = img.calc_memory_size()
-                    if mem > 0:
-                        mem_str = f"{mem // 1024}KB" if mem >= 1024 else f"{mem}B"
-                        img_info.append(f"({mem_str})")
-                    if img.blend_mode != "SRC_OVER":
-                        img_info.append(f"混合:{img.blend_mode}")
-                    matrix_str = img.get_matrix_str()
-                    if matrix_str != "Identity":
-                        img_info.append(f"变换:{matrix_str}")
-                    if img_info:
-                        desc_parts.append(f"  🖼️ {' '.join(img_info)}")
-                    break
-
-    # 添加异常原因
+
+def _make_image_describer(
+    image_by_offset: Dict[int, ImageDrawInfo],
+) -> Callable[[ParsedCommand, List[str]], None]:
+    """图片绘制信息：在 DATA(1) 命令（矩形绘制）时显示对应偏移的图片信息"""
+
+    def describe_image(cmd: ParsedCommand, desc_parts: List[str]):
+        if cmd.cmd_type != "DATA" or cmd.cmd_word & 0x0FFFFFFF != 1:
+            return
+        img = image_by_offset.get(cmd.offset)
+        if img is None:
+            return
+        img_info = []
+        if img.src_address:
+            img_info.append(f"源: 0x{img.src_address:08X}")
+        if img.src_format != "UNKNOWN":
+            img_info.append(f"{img.src_format}")
+        if img.src_width and img.src_height:
+            img_info.append(f"{img.src_width}x{img.src_height}")
+        if img.src_stride:
+            img_info.append(f"步长:{img.src_stride}")
+        mem = img.calc_memory_size()
+        if mem > 0:
+            mem_str = f"{mem // 1024}KB" if mem >= 1024 else f"{mem}B"
+            img_info.append(f"({mem_str})")
+        if img.blend_mode != "SRC_OVER":
+            img_info.append(f"混合:{img.blend_mode}")
+        matrix_str = img.get_matrix_str()
+        if matrix_str != "Identity":
+            img_info.append(f"变换:{matrix_str}")
+        if img_info:
+            desc_parts.append(f"  🖼️ {' '.join(img_info)}")
+
+    return describe_image
+
+
+def _describe_abnormal(cmd: ParsedCommand, desc_parts: List[str]):
+    """添加异常原因"""
     if cmd.is_abnormal and cmd.abnormal_reasons:
         for reason in cmd.abnormal_reasons:
             desc_parts.append(f"  ⚠️ {reason}")
 
-    table.add_row(
-        offset,
-        f"{cmd.cmd_word:08X}",
-        f"{cmd.data_word:08X}",
-        cmd.cmd_type,
-        "\n".join(desc_parts),
-        style=style,
-    )
+
+def make_row_formatter(
+    parser: "VGLiteCommandParser",
+) -> Callable[[ParsedCommand], CommandRow]:
+    """按解析器的显示选项生成专用的行格式化函数
+
+    选项只在这里判断一次，只保留启用的描述步骤，逐条格式化时不再重复检查；
+    同一次输出的所有段应复用返回的函数
+    """
+    steps = []
+    if parser.verbose:
+        steps.append(_describe_details)
+    if parser.parse_path:
+        steps.append(_describe_path)
+    if parser.parse_image and parser.image_by_offset:
+        steps.append(_make_image_describer(parser.image_by_offset))
+    steps.append(_describe_abnormal)
+
+    # 描述只取决于命令本身和显示选项，缓存在命令上，重复渲染时直接复用
+    key = (parser.verbose, parser.parse_path, parser.parse_image)
+
+    def format_row(cmd: ParsedCommand) -> CommandRow:
+        # 异常命令使用红色
+        if cmd.is_abnormal:
+            style = "bold red"
+            offset = f"⚠️ {cmd.offset:04X}"
+        else:
+            style = None
+            offset = f"{cmd.offset:04X}"
+
+        rendered = cmd._rendered
+        if rendered is None or rendered[0] != key:
+            desc_parts = [cmd.description]
+            for step in steps:
+                step(cmd, desc_parts)
+            rendered = cmd._rendered = (key, "\n".join(desc_parts))
+
+        # 固定格式的单元格直接使用 Text，跳过 markup 解析
+        cells = (
+            Text(offset),
+            Text(f"{cmd.cmd_word:08X}"),
+            Text(f"{cmd.data_word:08X}"),
+            Text(cmd.cmd_type),
+            rendered[1],
+        )
+        return cells, style
+
+    return format_row
+
+
+def format_command_row(cmd: ParsedCommand, parser: "VGLiteCommandParser") -> CommandRow:
+    """将命令格式化为表格行 (单元格, 行样式)
+
+    格式化大量命令时应使用 make_row_formatter 获取格式化函数后复用
+    """
+    return make_row_formatter(parser)(cmd)
 
 
 def print_summary(parser: "VGLiteCommandParser", console: Console):
@@ -125,15 +235,17 @@ def print_summary(parser: "VGLiteCommandParser", console: Console):
         summary_table.add_column("异常", style="red")
 
         for section in parser.command_sections:
-            cmd_counts = {}
-            for cmd in section["commands"]:
-                cmd_counts[cmd.cmd_type] = cmd_counts.get(cmd.cmd_type, 0) + 1
+            cmd_counts = section.get("cmd_type_counts")
+            if cmd_counts is None:
+                # 不是由解析器生成的段没有预先累计的统计，现场计数
+                cmd_counts = Counter(cmd.cmd_type for cmd in section["commands"])
 
             stats = ", ".join([f"{k}:{v}" for k, v in sorted(cmd_counts.items())])
             total = len(section["commands"])
             stats += f" (共{total}条)"
 
-            abnormal_count = sum(1 for cmd in section["commands"] if cmd.is_abnormal)
+            # 解析时已按段收集异常命令，无需再扫描全部命令
+            abnormal_count = len(section["abnormal_commands"])
             abnormal_str = f"{abnormal_count}" if abnormal_count > 0 else "-"
 
             summary_table.add_row(
@@ -150,9 +262,9 @@ def print_summary(parser: "VGLiteCommandParser", console: Console):
         # 打印异常命令详情
         all_abnormal = []
         for section in parser.command_sections:
-            for cmd in section["commands"]:
-                if cmd.is_abnormal:
-                    all_abnormal.append((section["name"], cmd))
+            all_abnormal.extend(
+                (section["name"], cmd) for cmd in section["abnormal_commands"]
+            )
 
         if all_abnormal:
             console.print()
@@ -190,9 +302,7 @@ def print_summary(parser: "VGLiteCommandParser", console: Console):
             _print_image_stats(parser.image_draws, console)
     else:
         # 兼容无段落模式
-        cmd_counts = {}
-        for cmd in parser.commands:
-            cmd_counts[cmd.cmd_type] = cmd_counts.get(cmd.cmd_type, 0) + 1
+        cmd_counts = Counter(cmd.cmd_type for cmd in parser.commands)
 
         summary_table = Table(
             title="命令统计", show_header=True, header_style="bold magenta"
@@ -220,18 +330,13 @@ def _print_image_stats(image_draws: List[ImageDrawInfo], console: Console):
     img_table.add_column("值", style="green")
 
     # 按格式统计
-    format_counts = {}
-    for img in image_draws:
-        fmt = img.src_format
-        format_counts[fmt] = format_counts.get(fmt, 0) + 1
+    format_counts = Counter(img.src_format for img in image_draws)
 
     # 按混合模式统计
-    blend_counts = {}
-    for img in image_draws:
-        blend_counts[img.blend_mode] = blend_counts.get(img.blend_mode, 0) + 1
+    blend_counts = Counter(img.blend_mode for img in image_draws)
 
     # 总内存
-    total_mem = sum(img.calc_memory_size() for img in image_draws)
+    total_mem = sum(map(ImageDrawInfo.calc_memory_size, image_draws))
     mem_str = f"{total_mem // 1024}KB" if total_mem >= 1024 else f"{total_mem}B"
 
     img_table.add_row(
@@ -245,9 +350,7 @@ def _print_image_stats(image_draws: List[ImageDrawInfo], console: Console):
     img_table.add_row("图片总数据量", mem_str)
 
     # 检测重复绘制
-    src_addr_counts = {}
-    for img in image_draws:
-        src_addr_counts[img.src_address] = src_addr_counts.get(img.src_address, 0) + 1
+    src_addr_counts = Counter(img.src_address for img in image_draws)
     repeated = sum(1 for c in src_addr_counts.values() if c > 1)
     if repeated > 0:
         img_table.add_row("重复绘制", f"{repeated} 个图片被多次绘制")
@@ -6,9 +6,18 @@ VGLite 路径数据解析器
 解析VGLite路径绘制命令中的路径数据
 """
 
+import itertools
 import struct
 from typing import List, Optional, Tuple
 
+# 尝试导入 numpy，用于批量解码路径数据
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 try:
     from .constants import VLC_OP_CODES
     from .models import PathSegment
@@ -16,6 +25,53 @@ except ImportError:
     from constants import VLC_OP_CODES
     from models import PathSegment
 
+# 尝试导入 Cython 构建的解析内核 (见 _path_parser_c.pyx)
+try:
+    try:
+        from ._path_parser_c import parse_bytes as _parse_bytes_c
+    except ImportError:
+        from _path_parser_c import parse_bytes as _parse_bytes_c
+
+    HAS_C_PARSER = True
+except ImportError:
+    HAS_C_PARSER = False
+
+# 传给 Cython 内核的格式编码，未知格式按 FP32 处理
+_FORMAT_CODES = {"S8": 1, "S16": 2, "S32": 3, "FP32": 4}
+
+# 各格式的 (元素字节数, 操作码解包函数, 坐标解包函数)，均为小端，模块加载时编译一次
+_FORMAT_READERS = {
+    "S8": (1, struct.Struct("<B").unpack_from, struct.Struct("<b").unpack_from),
+    "S16": (2, struct.Struct("<H").unpack_from, struct.Struct("<h").unpack_from),
+    "S32": (4, struct.Struct("<I").unpack_from, struct.Struct("<i").unpack_from),
+    "FP32": (4, struct.Struct("<I").unpack_from, struct.Struct("<f").unpack_from),
+}
+
+# 按操作码低 8 位索引的 (名称, 坐标数) 表，未定义的操作码为 None，免去逐段的字典查找
+_OP_TABLE: List[Optional[Tuple[str, int]]] = [None] * 256
+for _code, _op_info in VLC_OP_CODES.items():
+    if 0 <= _code <= 0xFF:
+        _OP_TABLE[_code] = _op_info
+del _code, _op_info
+
+# 路径数据较短时 numpy 的调用开销反而更大，超过该条目数 (dword 对) 才批量解码
+_NUMPY_MIN_PAIRS = 16
+
+if HAS_NUMPY:
+    # 各格式的 (操作码类型, 坐标类型)，均为小端
+    _NUMPY_DTYPES = {
+        "S8": (np.dtype("<u1"), np.dtype("<i1")),
+        "S16": (np.dtype("<u2"), np.dtype("<i2")),
+        "S32": (np.dtype("<u4"), np.dtype("<i4")),
+        "FP32": (np.dtype("<u4"), np.dtype("<f4")),
+    }
+
+
+def _pack_words(raw_data: List[Tuple[int, int]]) -> bytes:
+    """将 (dword1, dword2) 列表一次性展平成小端字节流"""
+    words = itertools.chain.from_iterable(raw_data)
+    return struct.pack(f"<{len(raw_data) * 2}I", *words)
+
 
 class VGLitePathParser:
     """VGLite路径数据解析器"""
@@ -39,42 +95,46 @@ class VGLitePathParser:
         if not raw_data:
             return []
 
-        # 将所有数据展平成字节流
-        bytes_data = bytearray()
-        for d1, d2 in raw_data:
-            bytes_data.extend(struct.pack("<II", d1, d2))
+        if not HAS_C_PARSER and HAS_NUMPY and len(raw_data) >= _NUMPY_MIN_PAIRS:
+            return self._parse_numpy(raw_data)
 
-        return self._parse_bytes(bytes_data)
+        return self._parse_bytes(_pack_words(raw_data))
 
-    def _parse_bytes(self, data: bytearray) -> List[PathSegment]:
+    def _parse_bytes(self, data: bytes) -> List[PathSegment]:
         """从字节流解析路径段"""
+        if HAS_C_PARSER:
+            return _parse_bytes_c(
+                data, _FORMAT_CODES.get(self.path_format, 4), VLC_OP_CODES, PathSegment
+            )
+
+        size, unpack_opcode, unpack_coord = _FORMAT_READERS.get(
+            self.path_format, _FORMAT_READERS["FP32"]
+        )
+        length = len(data)
         segments = []
         offset = 0
 
-        while offset < len(data):
-            # 根据格式获取操作码
-            opcode = self._read_opcode(data, offset)
-            if opcode is None:
-                break
+        # 剩余字节不足一个元素时无法再读取操作码
+        while offset + size <= length:
+            opcode = unpack_opcode(data, offset)[0]
 
-            op_info = VLC_OP_CODES.get(opcode & 0xFF)
+            op_info = _OP_TABLE[opcode & 0xFF]
             if op_info is None:
                 # 未知操作码，尝试跳过
-                offset += self._get_format_size()
+                offset += size
                 continue
 
             op_name, coord_count = op_info
 
             # 读取坐标数据
-            offset += self._get_format_size()  # 跳过操作码
+            offset += size  # 跳过操作码
             coords = []
             for _ in range(coord_count):
-                if offset >= len(data):
+                if offset >= length:
                     break
-                coord = self._read_coord(data, offset)
-                if coord is not None:
-                    coords.append(coord)
-                offset += self._get_format_size()
+                if offset + size <= length:
+                    coords.append(float(unpack_coord(data, offset)[0]))
+                offset += size
 
             segments.append(PathSegment(opcode=opcode, op_name=op_name, coords=coords))
 
@@ -84,48 +144,41 @@ class VGLitePathParser:
 
         return segments
 
-    def _get_format_size(self) -> int:
-        """获取单个数据元素的字节大小"""
-        if self.path_format == "S8":
-            return 1
-        elif self.path_format == "S16":
-            return 2
-        elif self.path_format in ("S32", "FP32"):
-            return 4
-        return 4
-
-    def _read_opcode(self, data: bytearray, offset: int) -> Optional[int]:
-        """读取操作码"""
-        if offset >= len(data):
-            return None
-
-        if self.path_format == "S8":
-            return data[offset]
-        elif self.path_format == "S16":
-            if offset + 2 > len(data):
-                return None
-            return struct.unpack_from("<H", data, offset)[0]
-        else:  # S32 or FP32
-            if offset + 4 > len(data):
-                return None
-            return struct.unpack_from("<I", data, offset)[0]
-
-    def _read_coord(self, data: bytearray, offset: int) -> Optional[float]:
-        """读取坐标值"""
-        if offset >= len(data):
-            return None
-
-        if self.path_format == "S8":
-            return float(struct.unpack_from("<b", data, offset)[0])
-        elif self.path_format == "S16":
-            if offset + 2 > len(data):
-                return None
-            return float(struct.unpack_from("<h", data, offset)[0])
-        elif self.path_format == "S32":
-            if offset + 4 > len(data):
-                return None
-            return float(struct.unpack_from("<i", data, offset)[0])
-        else:  # FP32
-            if offset + 4 > len(data):
-                return None
-            return struct.unpack_from("<f", data, offset)[0]
+    def _parse_numpy(self, raw_data: List[Tuple[int, int]]) -> List[PathSegment]:
+        """用 numpy 一次性把字节流解码为操作码和坐标数组，只在 Python 中遍历操作码
+
+        结果与 _parse_bytes 相同
+        """
+        op_dtype, coord_dtype = _NUMPY_DTYPES.get(
+            self.path_format, _NUMPY_DTYPES["FP32"]
+        )
+        buf = _pack_words(raw_data)
+        opcodes = np.frombuffer(buf, dtype=op_dtype).tolist()
+        # FP32 数据中可能出现 NaN，转换时不需要告警
+        with np.errstate(invalid="ignore"):
+            coords_all = np.frombuffer(buf, dtype=coord_dtype).astype(np.float64)
+        coords_all = coords_all.tolist()
+
+        segments = []
+        count = len(opcodes)
+        i = 0
+        while i < count:
+            opcode = opcodes[i]
+            i += 1
+
+            op_info = _OP_TABLE[opcode & 0xFF]
+            if op_info is None:
+                # 未知操作码，尝试跳过
+                continue
+
+            op_name, coord_count = op_info
+            coords = coords_all[i : i + coord_count]
+            i += coord_count
+
+            segments.append(PathSegment(opcode=opcode, op_name=op_name, coords=coords))
+
+            # 遇到 END 或 CLOSE 可以继续解析（可能有多个子路径）
+            if opcode == 0x00:  # END
+                break
+
+        return segments
@@ -6,7 +6,10 @@ VGLite GPU 寄存器分析器
 分析 GPU 硬件寄存器状态
 """
 
+import functools
 import re
+from typing import Iterable, Tuple
+
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
@@ -17,92 +20,65 @@ except ImportError:
     from constants import GPU_REGISTER_INFO
 
 
-class GPURegisterAnalyzer:
-    """GPU 硬件寄存器分析器"""
-
-    def __init__(self):
-        self.registers = {}  # 单值寄存器
-        self.register_arrays = {}  # 数组形式的寄存器
-
-    def parse_registers(self, log_text: str):
-        """从日志中解析寄存器值"""
-        lines = log_text.split("\n")
-
-        for line in lines:
-            # 跳过命令缓冲区部分
-            if (
-                "init command buffer" in line.lower()
-                or "last submit command" in line.lower()
-            ):
-                break
-
-            # 匹配 "idle = 0x..." 或 "AQHiClockControl = 0x..." 格式
-            match = re.search(r"(\w+)\s*=\s*(0x[0-9a-fA-F]+)", line)
-            if match:
-                name = match.group(1)
-                value = match.group(2).lower()
-                self.registers[name] = value
-                continue
-
-            # 匹配 "0xXX = 0x..." 格式 (单个寄存器)
-            match = re.search(
-                r"\]\s*(?:\[ap\])?\s*(0x[0-9a-fA-F]+)\s*=\s*(0x[0-9a-fA-F]+)", line
-            )
-            if match:
-                addr = match.group(1).lower()
-                value = match.group(2).lower()
-                self.registers[addr] = value
-                continue
-
-            # 匹配 "0xXX[N] = 0x..." 格式 (寄存器数组)
-            match = re.search(
-                r"\]\s*(?:\[ap\])?\s*(0x[0-9a-fA-F]+)\[(\d+)\]\s*=\s*(0x[0-9a-fA-F]+)",
-                line,
-            )
-            if match:
-                addr = match.group(1).lower()
-                index = int(match.group(2))
-                value = match.group(3).lower()
-                if addr not in self.register_arrays:
-                    self.register_arrays[addr] = {}
-                self.register_arrays[addr][index] = value
-
-    def analyze(self, console: Console):
-        """分析并输出寄存器信息"""
-        if not self.registers and not self.register_arrays:
-            return
-
-        console.print(Panel.fit("VGLite GPU 寄存器分析", style="bold magenta"))
-
-        # 基本状态和芯片信息表
-        self._print_basic_registers(console)
-
-        # 命令队列寄存器
-        self._print_cmd_queue_registers(console)
-
-        # 内存和调试寄存器
-        self._print_debug_registers(console)
-
-        # MMU寄存器
-        self._print_mmu_registers(console)
-
-        # 寄存器数组
-        self._print_register_arrays(console)
-
-        # 关键状态分析
-        self._print_analysis(console)
-
-    def _print_basic_registers(self, console: Console):
-        """打印基本状态寄存器"""
-        table = Table(
-            title="基本状态和芯片信息", show_header=True, header_style="bold cyan"
-        )
-        table.add_column("地址", style="yellow", width=20)
-        table.add_column("名称", style="green", width=22)
-        table.add_column("值", style="cyan", width=12)
-        table.add_column("说明", style="white", width=40)
-
-        basic_regs = [
+# 寄存器打印行匹配规则，模块加载时编译一次
+# "idle = 0x..."、"AQHiClockControl = 0x..." 以及 "0xXX = 0x..." (单个寄存器，
+# 地址本身也是 \w+，因此同样由该规则匹配)
+# 以 \b 锚定在单词开头，避免在单词内部的每个位置重复尝试 (最左匹配结果不变)
+_RE_NAMED_REG = re.compile(r"\b(\w+)\s*=\s*(0x[0-9a-fA-F]+)")
+# "0xXX[N] = 0x..." (寄存器数组)
+_RE_ARRAY_REG = re.compile(
+    r"\]\s*(?:\[ap\])?\s*(0x[0-9a-fA-F]+)\[(\d+)\]\s*=\s*(0x[0-9a-fA-F]+)"
+)
+
+# 命令缓冲区段的起始标记，寄存器打印在它之前 (与 feed_line 的判断一致)
+_RE_CMDBUF_SENTINEL = re.compile(
+    r"init command buffer|last submit command", re.IGNORECASE
+)
+
+# 寄存器打印行通常不超过 120 个字符，只对行首这部分做匹配，
+# 避免异常的超长行 (如合并的二进制数据) 拖慢正则
+_MAX_REG_LINE = 256
+
+
+# 寄存器数组地址 -> 名称
+_ARRAY_NAMES = {
+    "0x448": "模块调试寄存器组 (AQModuleDebug)",
+    "0x450": "管线调试寄存器组 (AQPipeDebug)",
+    "0x454": "获取调试寄存器组 (AQFetchDebug)",
+    "0x45c": "渲染调试寄存器组 (AQRenderDebug)",
+    "0x468": "细分调试寄存器组 (AQTessDebug)",
+    "0x46c": "路径调试寄存器组 (AQPathDebug)",
+}
+
+# 寄存器数组中的特殊值 -> 备注
+_ARRAY_VALUE_NOTES = {
+    "0xbabef00d": "未初始化标记",
+    "0x12345678": "测试/调试标记",
+    "0xaaaaaaaa": "填充标记",
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _hex_to_int(value: str) -> int:
+    """解析寄存器的十六进制值，同一个值只解析一次"""
+    return int(value, 16)
+
+
+def _register_group(*regs: str) -> Tuple[Tuple[str, str, str], ...]:
+    """按显示顺序预先筛出有说明的寄存器: ((地址, 名称, 说明), ...)"""
+    return tuple(
+        (reg,) + tuple(GPU_REGISTER_INFO[reg])
+        for reg in regs
+        if reg in GPU_REGISTER_INFO
+    )
+
+
+# 单值寄存器分组: (表格标题, 地址列宽, 寄存器)，模块加载时筛选一次
+_REGISTER_GROUPS = (
+    (
+        "基本状态和芯片信息",
+        20,
+        _register_group(
             "idle",
             "AQHiClockControl",
             "0x0c",
@@ -116,30 +92,12 @@ class GPURegisterAnalyzer:
             "0x2c",
             "0x30",
             "0x34",
-        ]
-
-        has_data = False
-        for reg in basic_regs:
-            if reg in self.registers and reg in GPU_REGISTER_INFO:
-                name, desc = GPU_REGISTER_INFO[reg]
-                table.add_row(reg, name, self.registers[reg], desc)
-                has_data = True
-
-        if has_data:
-            console.print(table)
-            console.print()
-
-    def _print_cmd_queue_registers(self, console: Console):
-        """打印命令队列寄存器"""
-        table = Table(
-            title="命令队列寄存器 (AQ)", show_header=True, header_style="bold cyan"
-        )
-        table.add_column("地址", style="yellow", width=8)
-        table.add_column("名称", style="green", width=22)
-        table.add_column("值", style="cyan", width=12)
-        table.add_column("说明", style="white", width=40)
-
-        cmd_regs = [
+        ),
+    ),
+    (
+        "命令队列寄存器 (AQ)",
+        8,
+        _register_group(
             "0x40",
             "0x44",
             "0x48",
@@ -149,30 +107,12 @@ class GPURegisterAnalyzer:
             "0x58",
             "0x5c",
             "0x60",
-        ]
-
-        has_data = False
-        for reg in cmd_regs:
-            if reg in self.registers and reg in GPU_REGISTER_INFO:
-                name, desc = GPU_REGISTER_INFO[reg]
-                table.add_row(reg, name, self.registers[reg], desc)
-                has_data = True
-
-        if has_data:
-            console.print(table)
-            console.print()
-
-    def _print_debug_registers(self, console: Console):
-        """打印调试寄存器"""
-        table = Table(
-            title="内存和调试寄存器", show_header=True, header_style="bold cyan"
-        )
-        table.add_column("地址", style="yellow", width=8)
-        table.add_column("名称", style="green", width=22)
-        table.add_column("值", style="cyan", width=12)
-        table.add_column("说明", style="white", width=40)
-
-        mem_regs = [
+        ),
+    ),
+    (
+        "内存和调试寄存器",
+        8,
+        _register_group(
             "0x98",
             "0xa4",
             "0xa8",
@@ -184,39 +124,128 @@ class GPURegisterAnalyzer:
             "0x43c",
             "0x440",
             "0x444",
-        ]
+        ),
+    ),
+    (
+        "MMU 寄存器",
+        8,
+        _register_group("0x500", "0x504", "0x508"),
+    ),
+)
 
-        has_data = False
-        for reg in mem_regs:
-            if reg in self.registers and reg in GPU_REGISTER_INFO:
-                name, desc = GPU_REGISTER_INFO[reg]
-                table.add_row(reg, name, self.registers[reg], desc)
-                has_data = True
 
-        if has_data:
-            console.print(table)
-            console.print()
+class GPURegisterAnalyzer:
+    """GPU 硬件寄存器分析器"""
+
+    @classmethod
+    def precompile(cls) -> int:
+        """预热: 确保模块级正则已在首次解析之前编译
+
+        Returns:
+            预编译的正则数量
+        """
+        patterns = (_RE_NAMED_REG, _RE_ARRAY_REG, _RE_CMDBUF_SENTINEL)
+        return len(patterns)
+
+    def __init__(self):
+        self.registers = {}  # 单值寄存器
+        self.register_arrays = {}  # 数组形式的寄存器
+        self._done = False  # 已进入命令缓冲区段
+
+    def parse_registers(self, log_text: str):
+        """从日志中解析寄存器值"""
+        # 先整体查找命令缓冲区段的起始行，只切分它之前的部分
+        match = _RE_CMDBUF_SENTINEL.search(log_text)
+        if match:
+            log_text = log_text[: log_text.rfind("\n", 0, match.start()) + 1]
+        self.parse_register_lines(log_text.split("\n"))
+
+    def parse_register_lines(self, lines: Iterable[str]):
+        """从日志行迭代器中解析寄存器值，遇到命令缓冲区段即停止"""
+        # 每次调用都是独立的一次解析，之前遇到的命令缓冲区段不影响本次输入
+        self._done = False
+        for line in lines:
+            if not self.feed_line(line):
+                break
 
-    def _print_mmu_registers(self, console: Console):
-        """打印MMU寄存器"""
-        table = Table(title="MMU 寄存器", show_header=True, header_style="bold cyan")
-        table.add_column("地址", style="yellow", width=8)
+    def feed_line(self, line: str) -> bool:
+        """推入一行日志，返回 False 表示已进入命令缓冲区段，后续行不再处理"""
+        if self._done:
+            return False
+
+        # 跳过命令缓冲区部分
+        line_lower = line.lower()
+        if "init command buffer" in line_lower or "last submit command" in line_lower:
+            self._done = True
+            return False
+
+        line = line[:_MAX_REG_LINE]
+
+        # 预筛: 寄存器行必然同时包含 "=" 和 "0x"，其余行不跑正则
+        if "=" not in line or "0x" not in line:
+            return True
+
+        # 匹配 "idle = 0x..."、"AQHiClockControl = 0x..." 或 "0xXX = 0x..." 格式
+        match = _RE_NAMED_REG.search(line)
+        if match:
+            name = match.group(1)
+            value = match.group(2).lower()
+            self.registers[name] = value
+            return True
+
+        # 匹配 "0xXX[N] = 0x..." 格式 (寄存器数组)
+        match = _RE_ARRAY_REG.search(line)
+        if match:
+            addr = match.group(1).lower()
+            index = int(match.group(2))
+            value = match.group(3).lower()
+            self.register_arrays.setdefault(addr, {})[index] = value
+        return True
+
+    def analyze(self, console: Console):
+        """分析并输出寄存器信息"""
+        if not self.registers and not self.register_arrays:
+            return
+
+        console.print(Panel.fit("VGLite GPU 寄存器分析", style="bold magenta"))
+
+        # 基本状态和芯片信息、命令队列、内存和调试、MMU 寄存器表
+        for title, addr_width, regs in _REGISTER_GROUPS:
+            self._print_register_group(console, title, addr_width, regs)
+
+        # 寄存器数组
+        self._print_register_arrays(console)
+
+        # 关键状态分析
+        self._print_analysis(console)
+
+    def _print_register_group(
+        self,
+        console: Console,
+        title: str,
+        addr_width: int,
+        regs: Tuple[Tuple[str, str, str], ...],
+    ):
+        """打印一组单值寄存器，组内没有解析到任何寄存器时不输出"""
+        registers = self.registers
+        rows = [
+            (reg, name, registers[reg], desc)
+            for reg, name, desc in regs
+            if reg in registers
+        ]
+        if not rows:
+            return
+
+        table = Table(title=title, show_header=True, header_style="bold cyan")
+        table.add_column("地址", style="yellow", width=addr_width)
         table.add_column("名称", style="green", width=22)
         table.add_column("值", style="cyan", width=12)
         table.add_column("说明", style="white", width=40)
+        for row in rows:
+            table.add_row(*row)
 
-        mmu_regs = ["0x500", "0x504", "0x508"]
-
-        has_data = False
-        for reg in mmu_regs:
-            if reg in self.registers and reg in GPU_REGISTER_INFO:
-                name, desc = GPU_REGISTER_INFO[reg]
-                table.add_row(reg, name, self.registers[reg], desc)
-                has_data = True
-
-        if has_data:
-            console.print(table)
-            console.print()
+        console.print(table)
+        console.print()
 
     def _print_register_arrays(self, console: Console):
         """打印寄存器数组"""
@@ -225,17 +254,8 @@ class GPURegisterAnalyzer:
 
         console.print(Panel.fit("调试寄存器组 (数组形式)", style="bold blue"))
 
-        array_names = {
-            "0x448": "模块调试寄存器组 (AQModuleDebug)",
-            "0x450": "管线调试寄存器组 (AQPipeDebug)",
-            "0x454": "获取调试寄存器组 (AQFetchDebug)",
-            "0x45c": "渲染调试寄存器组 (AQRenderDebug)",
-            "0x468": "细分调试寄存器组 (AQTessDebug)",
-            "0x46c": "路径调试寄存器组 (AQPathDebug)",
-        }
-
         for addr, values in sorted(self.register_arrays.items()):
-            title = array_names.get(addr, f"寄存器组 {addr}")
+            title = _ARRAY_NAMES.get(addr, f"寄存器组 {addr}")
             table = Table(
                 title=f"{addr} {title}", show_header=True, header_style="bold cyan"
             )
@@ -243,17 +263,8 @@ class GPURegisterAnalyzer:
             table.add_column("值", style="cyan", width=12)
             table.add_column("备注", style="dim")
 
-            for idx in sorted(values.keys()):
-                val = values[idx]
-                note = ""
-                # 检测特殊值
-                if val == "0xbabef00d":
-                    note = "未初始化标记"
-                elif val == "0x12345678":
-                    note = "测试/调试标记"
-                elif val == "0xaaaaaaaa":
-                    note = "填充标记"
-                table.add_row(str(idx), val, note)
+            for idx, val in sorted(values.items()):
+                table.add_row(str(idx), val, _ARRAY_VALUE_NOTES.get(val, ""))
 
             console.print(table)
             console.print()
@@ -268,18 +279,18 @@ class GPURegisterAnalyzer:
 
         # 芯片信息
         if "0x1c" in self.registers:
-            chip_id = int(self.registers["0x1c"], 16)
+            chip_id = _hex_to_int(self.registers["0x1c"])
             analysis.add_row("芯片ID", f"0x{chip_id:08X} (Vivante GC系列)")
 
         if "0x20" in self.registers:
-            chip_rev = int(self.registers["0x20"], 16)
+            chip_rev = _hex_to_int(self.registers["0x20"])
             analysis.add_row("芯片版本", f"0x{chip_rev:04X}")
 
         if "0x28" in self.registers:
             chip_time = self.registers["0x28"]
             # 尝试解析日期格式
             try:
-                val = int(chip_time, 16)
+                val = _hex_to_int(chip_time)
                 year = val // 10000
                 month = (val % 10000) // 100
                 day = val % 100
@@ -291,20 +302,20 @@ class GPURegisterAnalyzer:
 
         # 命令缓冲区状态
         if "0x4c" in self.registers:
-            cmd_start = int(self.registers["0x4c"], 16)
+            cmd_start = _hex_to_int(self.registers["0x4c"])
             analysis.add_row("命令缓冲区起始", f"0x{cmd_start:08X}")
 
         if "0x40" in self.registers:
-            cmd_addr = int(self.registers["0x40"], 16)
+            cmd_addr = _hex_to_int(self.registers["0x40"])
             analysis.add_row("命令缓冲区当前", f"0x{cmd_addr:08X}")
 
         if "0x50" in self.registers:
-            fetch_addr = int(self.registers["0x50"], 16)
+            fetch_addr = _hex_to_int(self.registers["0x50"])
             analysis.add_row("获取地址/PC", f"0x{fetch_addr:08X}")
 
         # GPU状态
         if "idle" in self.registers:
-            idle_val = int(self.registers["idle"], 16)
+            idle_val = _hex_to_int(self.registers["idle"])
             if idle_val == 0x7FFFFFFF:
                 analysis.add_row("GPU状态", "[green]空闲 (所有模块idle)[/green]")
             else:
@@ -312,11 +323,11 @@ class GPURegisterAnalyzer:
 
         # MMU状态
         if "0x504" in self.registers:
-            mmu_status = int(self.registers["0x504"], 16)
+            mmu_status = _hex_to_int(self.registers["0x504"])
             analysis.add_row("MMU状态", f"0x{mmu_status:03X}")
 
         if "0x508" in self.registers:
-            mmu_exception = int(self.registers["0x508"], 16)
+            mmu_exception = _hex_to_int(self.registers["0x508"])
             if mmu_exception != 0:
                 analysis.add_row(
                     "MMU异常地址", f"[bold red]0x{mmu_exception:08X}[/bold red]"
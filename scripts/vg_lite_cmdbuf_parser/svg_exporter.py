@@ -6,12 +6,22 @@ VGLite SVG/HTML 导出器
 将解析的 VGLite 命令导出为 SVG 或交互式 HTML 可视化文件
 """
 
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, TextIO, Tuple
 import html
 import hashlib
 import base64
+import functools
 import io
+from array import array
+import struct
+from operator import attrgetter
+
+try:
+    from ._html_template import HTML_PARTS
+except ImportError:
+    from _html_template import HTML_PARTS
 
 # 尝试导入 PIL，用于生成目标缓冲区图像
 try:
@@ -21,6 +31,77 @@ try:
 except ImportError:
     HAS_PIL = False
 
+# 尝试导入 numpy，用于批量变换路径坐标
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# 坐标较少时 numpy 的调用开销反而更大，超过该数量才批量变换
+_NUMPY_MIN_COORDS = 64
+# 同理，绘制命令超过该数量才用 numpy 批量拆分颜色分量
+_NUMPY_MIN_COLORS = 32
+
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+# 路径操作 -> (SVG path 命令格式, 所需坐标数)
+_SVG_PATH_FORMATS = {
+    "MOVE": ("M %.2f %.2f", 2),
+    "LINE": ("L %.2f %.2f", 2),
+    "QUAD": ("Q %.2f %.2f %.2f %.2f", 4),
+    "CUBIC": ("C %.2f %.2f %.2f %.2f %.2f %.2f", 6),
+    "CLOSE": ("Z", 0),
+}
+
+
+# 目标缓冲区格式 -> ((R, G, B, A 在像素中的字节序号), 是否忽略 alpha 视为不透明)
+_TARGET_PIXEL_LAYOUTS = {
+    0: ((0, 1, 2, 3), False),  # RGBA8888
+    1: ((2, 1, 0, 3), False),  # BGRA8888
+    2: ((0, 1, 2, 3), True),  # RGBX8888
+    3: ((2, 1, 0, 3), True),  # BGRX8888
+}
+
+# 目标缓冲区格式 -> (PIL 图像模式, raw 解码模式)，数据完整时由 PIL 直接解码
+_TARGET_RAW_MODES = {
+    0: ("RGBA", "RGBA"),
+    1: ("RGBA", "BGRA"),
+    2: ("RGB", "RGBX"),
+    3: ("RGB", "BGRX"),
+}
+
+# 寄存器原始值按 float 解释时使用，模块加载时编译一次
+_U32_PACK = struct.Struct("<I").pack
+_F32_UNPACK = struct.Struct("<f").unpack
+
+# VGLite 单位矩阵 (m00, m01, m02, m10, m11, m12)
+_IDENTITY_MATRIX = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0)
+
+# 变换矩阵的缓存键: 6 个分量的 double 二进制表示
+_MATRIX_KEY_PACK = struct.Struct("<6d").pack
+
+
+def _u32_as_f32(value: int) -> float:
+    """将寄存器的 32 位原始值按 IEEE754 单精度浮点数解释"""
+    return _F32_UNPACK(_U32_PACK(value))[0]
+
+
+# 路径的 SoA 形式: (各段操作名, 连续坐标数组, 各段坐标偏移)
+PackedPath = Tuple[Tuple[str, ...], Sequence[float], Tuple[int, ...]]
+
+
+def _segment_accessors(segments: List):
+    """按首个路径段的类型选择 (取操作名, 取坐标) 函数
+
+    同一条路径的段类型一致: PathSegment 有 op_name/coords 属性，
+    也兼容 {"op": ..., "coords": ...} 形式的字典
+    """
+    if hasattr(segments[0], "op_name"):
+        return attrgetter("op_name"), attrgetter("coords")
+    return (lambda seg: seg.get("op", "")), (lambda seg: seg.get("coords", []))
+
 
 @dataclass
 class DrawCommand:
@@ -30,38 +111,174 @@ class DrawCommand:
     color: int = 0xFFFFFFFF  # ARGB 颜色
     opacity: float = 1.0  # 不透明度
     fill_rule: str = "nonzero"  # 填充规则: nonzero, evenodd
-    matrix: Optional[List[float]] = None  # 变换矩阵 [m00, m01, m02, m10, m11, m12]
+    # 变换矩阵 (m00, m01, m02, m10, m11, m12)
+    matrix: Optional[Tuple[float, ...]] = None
     path_scale: float = 1.0  # 路径缩放
     path_bias: float = 0.0  # 路径偏移
     split_count: int = 1  # VGLite SPLIT 策略分割次数
     bounding_box: Optional[Tuple[int, int, int, int]] = (
         None  # (x, y, width, height) 路径裁剪区域
     )
+    # path_segments 的 SoA 形式缓存，见 packed_path
+    _packed: Optional[PackedPath] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # get_hash_key 的结果缓存
+    _hash_key: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # SVG path d 属性缓存，见 SVGExporter._path_to_svg
+    _path_d: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def packed_path(self) -> PackedPath:
+        """
+        路径段的 SoA 形式，首次调用时生成并缓存 (之后不应再修改 path_segments)
+
+        Returns:
+            (各段操作名, 全部坐标的连续 double 数组, 各段坐标起始偏移)，
+            偏移比段数多一个，第 i 段坐标为 coords[offsets[i]:offsets[i + 1]]
+        """
+        packed = self._packed
+        if packed is None:
+            ops = []
+            coords = array("d")
+            offsets = [0]
+            if self.path_segments:
+                get_op, get_coords = _segment_accessors(self.path_segments)
+                for seg in self.path_segments:
+                    ops.append(get_op(seg))
+                    coords.extend(get_coords(seg))
+                    offsets.append(len(coords))
+            packed = self._packed = (tuple(ops), coords, tuple(offsets))
+        return packed
 
     def get_hash_key(self) -> str:
-        """生成路径的唯一哈希键，用于去重"""
-        # 基于路径数据、颜色、变换矩阵等生成哈希
-        key_parts = []
+        """生成路径的唯一哈希键，用于去重 (首次调用时计算并缓存，之后不应再修改命令)"""
+        if self._hash_key is None:
+            self._hash_key = self._compute_hash_key()
+        return self._hash_key
 
-        # 路径段数据
-        for seg in self.path_segments:
-            op = seg.op_name if hasattr(seg, "op_name") else seg.get("op", "")
-            coords = seg.coords if hasattr(seg, "coords") else seg.get("coords", [])
-            key_parts.append(f"{op}:{','.join(f'{c:.4f}' for c in coords)}")
+    def _compute_hash_key(self) -> str:
+        """基于路径数据、颜色、变换矩阵等生成哈希
+
+        坐标和矩阵直接按二进制表示送入哈希，不再逐个格式化为字符串；
+        SPLIT 重复下发的路径数据完全相同，按精确值比较即可
+        """
+        # 只用于区分路径，64 位摘要足够，blake2b 比 md5 更快
+        h = hashlib.blake2b(digest_size=8)
+
+        # 路径段数据: 操作名、各段坐标偏移、全部坐标
+        ops, coords, offsets = self.packed_path()
+        h.update(" ".join(ops).encode())
+        h.update(array("q", offsets).tobytes())
+        h.update(coords.tobytes())
 
         # 颜色
-        key_parts.append(f"color:{self.color}")
+        h.update(f"|color:{self.color}|".encode())
 
         # 变换矩阵
         if self.matrix:
-            key_parts.append(f"matrix:{','.join(f'{m:.6f}' for m in self.matrix)}")
+            h.update(array("d", self.matrix).tobytes())
+        h.update(b"|")
 
         # path scale 和 bias
-        key_parts.append(f"scale:{self.path_scale:.6f}")
-        key_parts.append(f"bias:{self.path_bias:.6f}")
+        h.update(array("d", (self.path_scale, self.path_bias)).tobytes())
+
+        return h.hexdigest()
+
+
+@dataclass
+class _DrawState:
+    """process_commands 遍历命令时累积的寄存器状态"""
+
+    draw: DrawCommand = field(default_factory=DrawCommand)  # 正在累积的绘制命令
+    matrix_values: Optional[List[float]] = None  # 矩阵寄存器的当前值
+    matrix: Optional[Tuple[float, ...]] = None  # 最近一次生成的矩阵元组
+    matrix_dirty: bool = False  # 矩阵寄存器在生成元组后是否被改写
+    path_scale: float = 1.0  # 当前路径缩放
+    path_bias: float = 0.0  # 当前路径偏移
+    tess_x: int = 0  # 裁剪窗口
+    tess_y: int = 0
+    tess_w: int = 0
+    tess_h: int = 0
+    # 裁剪窗口对应的 bounding box，窗口寄存器改写时更新，各路径共享同一个元组
+    bounding_box: Optional[Tuple[int, int, int, int]] = None
+
+    def update_bounding_box(self):
+        """裁剪窗口有效 (宽高均大于 0) 时生成 bounding box"""
+        if self.tess_w > 0 and self.tess_h > 0:
+            self.bounding_box = (self.tess_x, self.tess_y, self.tess_w, self.tess_h)
+        else:
+            self.bounding_box = None
+
+    def current_matrix(self) -> Optional[Tuple[float, ...]]:
+        """当前变换矩阵
+
+        矩阵保存为元组，只在寄存器改写后的首条路径生成新对象，
+        之后的路径直接共享同一个元组，无需逐条复制
+        """
+        if self.matrix_dirty:
+            self.matrix = tuple(self.matrix_values)
+            self.matrix_dirty = False
+        return self.matrix
+
+
+def _set_path_scale(state: _DrawState, value: int):
+    state.path_scale = _u32_as_f32(value)
+
+
+def _set_path_bias(state: _DrawState, value: int):
+    state.path_bias = _u32_as_f32(value)
+
+
+def _set_color(state: _DrawState, value: int):
+    state.draw.color = value
+
+
+def _set_fill_rule(state: _DrawState, value: int):
+    state.draw.fill_rule = "evenodd" if value & 0x1 else "nonzero"
+
+
+def _set_path_control(state: _DrawState, value: int):
+    # bit[4] = 1 表示 EVEN_ODD 填充规则
+    state.draw.fill_rule = "evenodd" if (value >> 4) & 0x1 else "nonzero"
+
 
-        key_str = "|".join(key_parts)
-        return hashlib.md5(key_str.encode()).hexdigest()
+def _set_matrix_element(idx: int, state: _DrawState, value: int):
+    # 连续写入 6 个矩阵寄存器时只改列表，到下一条路径才生成元组
+    if state.matrix_values is None:
+        state.matrix_values = list(_IDENTITY_MATRIX)
+    state.matrix_values[idx] = _u32_as_f32(value)
+    state.matrix_dirty = True
+
+
+def _set_tess_window(state: _DrawState, value: int):
+    state.tess_x = value & 0xFFFF
+    state.tess_y = (value >> 16) & 0xFFFF
+    state.update_bounding_box()
+
+
+def _set_tess_window_size(state: _DrawState, value: int):
+    state.tess_w = value & 0xFFFF
+    state.tess_h = (value >> 16) & 0xFFFF
+    state.update_bounding_box()
+
+
+# STATE 命令寄存器地址 -> 处理函数 (state, 寄存器值)
+_STATE_HANDLERS = {
+    0x0A28: _set_path_scale,  # VgPathScale
+    0x0A2C: _set_path_bias,  # VgPathBias
+    0x0A02: _set_color,  # VgColor - 主要使用这个
+    0x0A18: _set_color,  # VgFillColor - 备用
+    0x0A30: _set_fill_rule,  # VgFillRule
+    0x0A34: _set_path_control,  # VgPathControl - 包含填充规则
+    0x0A39: _set_tess_window,  # VgTessWindow - 裁剪窗口起点
+    0x0A3A: _set_tess_window_size,  # VgTessWindowSize - 裁剪窗口大小
+}
+# 变换矩阵 VgPathMatrix0-VgPathMatrix5 (0x0A40-0x0A45)
+_STATE_HANDLERS.update(
+    (0x0A40 + idx, functools.partial(_set_matrix_element, idx)) for idx in range(6)
+)
 
 
 class SVGExporter:
@@ -81,6 +298,11 @@ class SVGExporter:
         self.background_color = "#000000"  # 纯黑色背景
         self.target_info = None  # 渲染目标缓冲区信息
         self.context_state = None  # VGLite 上下文状态信息
+        # _matrix_to_svg 的结果缓存: 矩阵键 -> transform 属性，
+        # SPLIT 分割的路径以及交替使用的几个矩阵都直接复用
+        self._matrix_cache: Dict[bytes, str] = {}
+        # 目标缓冲区图像缓存: (缓冲区键, data URL)
+        self._target_image_cache: Tuple[Optional[tuple], Optional[str]] = (None, None)
 
     def set_target_info(self, target_info):
         """设置渲染目标缓冲区信息"""
@@ -108,56 +330,78 @@ class SVGExporter:
         fmt = self.target_info.format & 0x3FF  # 去掉标志位
         data = self.target_info.pixel_data
 
+        # 同一缓冲区重复导出时复用已编码的图像，按内容和尺寸格式判断
+        cache_key = (
+            width,
+            height,
+            stride,
+            fmt,
+            hashlib.blake2b(data, digest_size=16).digest(),
+        )
+        cached_key, cached_url = self._target_image_cache
+        if cache_key == cached_key:
+            return cached_url
+
         try:
-            # 创建图像
-            img = Image.new("RGBA", (width, height))
-            pixels = img.load()
-
-            for y in range(height):
-                row_offset = y * stride
-                for x in range(width):
-                    if fmt == 3:  # BGRX8888
-                        pixel_offset = row_offset + x * 4
-                        if pixel_offset + 4 <= len(data):
-                            b = data[pixel_offset]
-                            g = data[pixel_offset + 1]
-                            r = data[pixel_offset + 2]
-                            # X (忽略)
-                            pixels[x, y] = (r, g, b, 255)
-                    elif fmt == 1:  # BGRA8888
-                        pixel_offset = row_offset + x * 4
-                        if pixel_offset + 4 <= len(data):
-                            b = data[pixel_offset]
-                            g = data[pixel_offset + 1]
-                            r = data[pixel_offset + 2]
-                            a = data[pixel_offset + 3]
-                            pixels[x, y] = (r, g, b, a)
-                    elif fmt == 0:  # RGBA8888
-                        pixel_offset = row_offset + x * 4
-                        if pixel_offset + 4 <= len(data):
-                            r = data[pixel_offset]
-                            g = data[pixel_offset + 1]
-                            b = data[pixel_offset + 2]
-                            a = data[pixel_offset + 3]
-                            pixels[x, y] = (r, g, b, a)
-                    elif fmt == 2:  # RGBX8888
-                        pixel_offset = row_offset + x * 4
-                        if pixel_offset + 4 <= len(data):
-                            r = data[pixel_offset]
-                            g = data[pixel_offset + 1]
-                            b = data[pixel_offset + 2]
-                            pixels[x, y] = (r, g, b, 255)
+            layout = _TARGET_PIXEL_LAYOUTS.get(fmt)
+            if layout is None:
+                # 不支持的格式输出全透明图像
+                img = Image.new("RGBA", (width, height))
+            elif (
+                width > 0
+                and height > 0
+                and stride >= width * 4
+                and height * stride <= len(data)
+            ):
+                img = self._target_pixels_to_image_raw(data, width, height, stride, fmt)
+            else:
+                img = self._target_pixels_to_image(data, width, height, stride, layout)
 
             # 转换为 base64
             buffer = io.BytesIO()
-            img.save(buffer, format="PNG")
-            img_base64 = base64.b64encode(buffer.getvalue()).decode()
-            return f"data:image/png;base64,{img_base64}"
+            # 只用于页面预览，用最快的压缩级别
+            img.save(buffer, format="PNG", compress_level=1)
+            # getbuffer 直接引用编码结果，不额外复制一份 bytes
+            img_base64 = base64.b64encode(buffer.getbuffer()).decode("ascii")
+            data_url = f"data:image/png;base64,{img_base64}"
+            self._target_image_cache = (cache_key, data_url)
+            return data_url
 
         except Exception as e:
             print(f"[警告] 生成目标缓冲区图像失败: {e}")
             return None
 
+    @staticmethod
+    def _target_pixels_to_image(
+        data: bytes, width: int, height: int, stride: int, layout: Tuple[tuple, bool]
+    ) -> "Image.Image":
+        """按行用切片重排通道，数据不完整的像素保持透明"""
+        (ri, gi, bi, ai), opaque = layout
+        row_size = width * 4
+        out = bytearray(row_size * height)
+        for y in range(height):
+            row = data[y * stride : y * stride + row_size]
+            count = len(row) // 4  # 数据完整的像素数
+            if not count:
+                continue
+            base = y * row_size
+            end = base + count * 4
+            out[base:end:4] = row[ri::4][:count]
+            out[base + 1 : end : 4] = row[gi::4][:count]
+            out[base + 2 : end : 4] = row[bi::4][:count]
+            out[base + 3 : end : 4] = b"\xff" * count if opaque else row[ai::4][:count]
+        return Image.frombytes("RGBA", (width, height), bytes(out))
+
+    @staticmethod
+    def _target_pixels_to_image_raw(
+        data: bytes, width: int, height: int, stride: int, fmt: int
+    ) -> "Image.Image":
+        """用 PIL 的 raw 解码器直接按行步长解码目标缓冲区 (要求数据覆盖所有行)"""
+        mode, raw_mode = _TARGET_RAW_MODES[fmt]
+        img = Image.frombuffer(mode, (width, height), data, "raw", raw_mode, stride, 1)
+        # X 格式按 RGB 解码后补上不透明的 alpha
+        return img if mode == "RGBA" else img.convert("RGBA")
+
     def process_commands(self, commands: list):
         """
         处理解析的命令列表，提取绘制信息
@@ -165,92 +409,28 @@ class SVGExporter:
         Args:
             commands: ParsedCommand 列表
         """
-        current_draw = DrawCommand()
-        current_matrix = None
-        current_path_scale = 1.0
-        current_path_bias = 0.0
-        current_tess_x = 0
-        current_tess_y = 0
-        current_tess_w = 0
-        current_tess_h = 0
+        state = _DrawState()
+        handlers = _STATE_HANDLERS
 
         for cmd in commands:
             if cmd.cmd_type == "STATE":
-                reg_addr = cmd.cmd_word & 0xFFFF
-
-                # VgPathScale (0x0A28)
-                if reg_addr == 0x0A28:
-                    import struct
-
-                    current_path_scale = struct.unpack(
-                        "f", struct.pack("I", cmd.data_word)
-                    )[0]
-
-                # VgPathBias (0x0A2C)
-                elif reg_addr == 0x0A2C:
-                    import struct
-
-                    current_path_bias = struct.unpack(
-                        "f", struct.pack("I", cmd.data_word)
-                    )[0]
-
-                # VgColor (0x0A02) - 主要使用这个
-                elif reg_addr == 0x0A02:
-                    current_draw.color = cmd.data_word
-
-                # VgFillColor (0x0A18) - 备用
-                elif reg_addr == 0x0A18:
-                    current_draw.color = cmd.data_word
-
-                # VgFillRule (0x0A30)
-                elif reg_addr == 0x0A30:
-                    rule_val = cmd.data_word & 0x1
-                    current_draw.fill_rule = "evenodd" if rule_val else "nonzero"
-
-                # VgPathControl (0x0A34) - 包含填充规则
-                elif reg_addr == 0x0A34:
-                    # bit[4] = 1 表示 EVEN_ODD 填充规则
-                    rule_val = (cmd.data_word >> 4) & 0x1
-                    current_draw.fill_rule = "evenodd" if rule_val else "nonzero"
-
-                # 变换矩阵 VgPathMatrix0-VgPathMatrix5 (0x0A40-0x0A45)
-                elif 0x0A40 <= reg_addr <= 0x0A45:
-                    if current_matrix is None:
-                        current_matrix = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0]
-                    idx = reg_addr - 0x0A40
-                    if idx < 6:
-                        import struct
-
-                        current_matrix[idx] = struct.unpack(
-                            "f", struct.pack("I", cmd.data_word)
-                        )[0]
-
-                # VgTessWindow (0x0A39) - 裁剪窗口起点
-                elif reg_addr == 0x0A39:
-                    current_tess_x = cmd.data_word & 0xFFFF
-                    current_tess_y = (cmd.data_word >> 16) & 0xFFFF
-
-                # VgTessWindowSize (0x0A3A) - 裁剪窗口大小
-                elif reg_addr == 0x0A3A:
-                    current_tess_w = cmd.data_word & 0xFFFF
-                    current_tess_h = (cmd.data_word >> 16) & 0xFFFF
+                # 按寄存器地址直接查表分派，不逐个比较
+                handler = handlers.get(cmd.cmd_word & 0xFFFF)
+                if handler is not None:
+                    handler(state, cmd.data_word)
 
             # 处理所有带路径数据的命令 (DATA, DRAW_PATH, CALL 等)
             if cmd.path_segments:
+                current_draw = state.draw
                 current_draw.path_segments = cmd.path_segments
-                current_draw.matrix = current_matrix.copy() if current_matrix else None
-                current_draw.path_scale = current_path_scale
-                current_draw.path_bias = current_path_bias
+                current_draw.matrix = state.current_matrix()
+                current_draw.path_scale = state.path_scale
+                current_draw.path_bias = state.path_bias
                 # 保存当前的 bounding box
-                if current_tess_w > 0 and current_tess_h > 0:
-                    current_draw.bounding_box = (
-                        current_tess_x,
-                        current_tess_y,
-                        current_tess_w,
-                        current_tess_h,
-                    )
+                if state.bounding_box is not None:
+                    current_draw.bounding_box = state.bounding_box
                 self.draw_commands.append(current_draw)
-                current_draw = DrawCommand()
+                state.draw = DrawCommand()
 
     def _color_to_rgba(self, color: int) -> Tuple[int, int, int, float]:
         """将 ARGB 颜色转换为 RGBA 元组"""
@@ -260,51 +440,74 @@ class SVGExporter:
         b = color & 0xFF
         return (r, g, b, a / 255.0)
 
+    def _colors_to_rgba(
+        self, draw_commands: List[DrawCommand]
+    ) -> List[Tuple[int, int, int, float]]:
+        """批量将绘制命令的 ARGB 颜色转换为 RGBA 元组，与 _color_to_rgba 结果一致"""
+        if not HAS_NUMPY or len(draw_commands) < _NUMPY_MIN_COLORS:
+            return [self._color_to_rgba(d.color) for d in draw_commands]
+
+        colors = np.fromiter(
+            (d.color for d in draw_commands), dtype=np.int64, count=len(draw_commands)
+        )
+        a = (colors >> 24) & 0xFF
+        r = (colors >> 16) & 0xFF
+        g = (colors >> 8) & 0xFF
+        b = colors & 0xFF
+        # alpha 保持 float64，与逐个计算的 a / 255.0 完全相同
+        alpha = a / 255.0
+        return list(zip(r.tolist(), g.tolist(), b.tolist(), alpha.tolist()))
+
     def _path_to_svg(self, draw_cmd: DrawCommand) -> str:
-        """将路径段转换为 SVG path d 属性"""
+        """将路径段转换为 SVG path d 属性 (缓存在命令上，重复导出时直接复用)"""
+        d = draw_cmd._path_d
+        if d is None:
+            d = draw_cmd._path_d = self._format_path_d(draw_cmd)
+        return d
+
+    @staticmethod
+    def _format_path_d(draw_cmd: DrawCommand) -> str:
+        """生成路径的 d 属性"""
         if not draw_cmd.path_segments:
             return ""
 
         d_parts = []
         scale = draw_cmd.path_scale
         bias = draw_cmd.path_bias
-
-        for seg in draw_cmd.path_segments:
-            # PathSegment 是 dataclass，有 op_name 和 coords 属性
-            op = seg.op_name if hasattr(seg, "op_name") else seg.get("op", "")
-            coords = seg.coords if hasattr(seg, "coords") else seg.get("coords", [])
-
-            # 应用 scale 和 bias
-            scaled_coords = [c * scale + bias for c in coords]
-
-            if op == "MOVE":
-                if len(scaled_coords) >= 2:
-                    d_parts.append(f"M {scaled_coords[0]:.2f} {scaled_coords[1]:.2f}")
-            elif op == "LINE":
-                if len(scaled_coords) >= 2:
-                    d_parts.append(f"L {scaled_coords[0]:.2f} {scaled_coords[1]:.2f}")
-            elif op == "QUAD":
-                if len(scaled_coords) >= 4:
-                    d_parts.append(
-                        f"Q {scaled_coords[0]:.2f} {scaled_coords[1]:.2f} {scaled_coords[2]:.2f} {scaled_coords[3]:.2f}"
-                    )
-            elif op == "CUBIC":
-                if len(scaled_coords) >= 6:
-                    d_parts.append(
-                        f"C {scaled_coords[0]:.2f} {scaled_coords[1]:.2f} {scaled_coords[2]:.2f} {scaled_coords[3]:.2f} {scaled_coords[4]:.2f} {scaled_coords[5]:.2f}"
-                    )
-            elif op == "CLOSE":
-                d_parts.append("Z")
-            elif op == "END":
-                pass  # 忽略 END
+        ops, coords, offsets = draw_cmd.packed_path()
+
+        # 整条路径的坐标一次性应用 scale 和 bias (坐标本身是连续数组，numpy 可直接引用)
+        if HAS_NUMPY and len(coords) >= _NUMPY_MIN_COORDS:
+            scaled = (np.frombuffer(coords, dtype=np.float64) * scale + bias).tolist()
+        else:
+            scaled = [c * scale + bias for c in coords]
+
+        for op, start, end in zip(ops, offsets, offsets[1:]):
+            # END 和其他操作码不输出
+            op_format = _SVG_PATH_FORMATS.get(op)
+            if op_format is None:
+                continue
+            fmt, count = op_format
+            if end - start >= count:
+                d_parts.append(fmt % tuple(scaled[start : start + count]))
 
         return " ".join(d_parts)
 
-    def _matrix_to_svg(self, matrix: Optional[List[float]]) -> str:
+    def _matrix_to_svg(self, matrix: Optional[Sequence[float]]) -> str:
         """将 VGLite 矩阵转换为 SVG transform 属性"""
         if matrix is None:
             return ""
 
+        # 按二进制表示比较，-0.0 和 0.0 格式化结果不同，不能用 == 判断
+        key = _MATRIX_KEY_PACK(*matrix)
+        result = self._matrix_cache.get(key)
+        if result is None:
+            result = self._matrix_cache[key] = self._format_matrix_transform(matrix)
+        return result
+
+    @staticmethod
+    def _format_matrix_transform(matrix: Sequence[float]) -> str:
+        """生成矩阵对应的 transform 属性，单位矩阵和无效矩阵返回空字符串"""
         # VGLite 矩阵格式: [m00, m01, m02, m10, m11, m12]
         m00, m01, m02, m10, m11, m12 = matrix
 
@@ -340,9 +543,9 @@ class SVGExporter:
         Args:
             filename: 输出文件路径
         """
-        svg_content = self._generate_svg()
+        # 逐个路径直接写入文件，不在内存中拼出完整的 SVG
         with open(filename, "w", encoding="utf-8") as f:
-            f.write(svg_content)
+            self._write_svg(f)
 
     def export_html(self, filename: str):
         """
@@ -351,52 +554,84 @@ class SVGExporter:
         Args:
             filename: 输出文件路径
         """
-        svg_content = self._generate_svg()
-        html_content = self._wrap_in_html(svg_content)
+        # SVG 部分直接写入 HTML 文件，不单独生成完整的 SVG 字符串
         with open(filename, "w", encoding="utf-8") as f:
-            f.write(html_content)
+            self._write_html(f)
 
     def _generate_svg(self) -> str:
         """生成 SVG 内容"""
-        paths = []
-        clip_paths = []  # 存储 clipPath 定义
-
+        buf = io.StringIO()
+        self._write_svg(buf)
+        return buf.getvalue()
+
+    @staticmethod
+    def _has_path_data(draw_cmd: DrawCommand) -> bool:
+        """路径是否会生成非空的 d 属性 (与 _path_to_svg 的输出条件一致)"""
+        ops, _, offsets = draw_cmd.packed_path()
+        for op, start, end in zip(ops, offsets, offsets[1:]):
+            op_format = _SVG_PATH_FORMATS.get(op)
+            if op_format is not None and end - start >= op_format[1]:
+                return True
+        return False
+
+    def _write_svg(self, f: TextIO, xml_declaration: bool = True):
+        """将 SVG 内容逐段写入文本流 (嵌入 HTML 时不写 XML 声明)"""
+        write = f.write
         # 统计每个 hash 出现的次数，用于标记 SPLIT 分割的路径
-        hash_count = {}
-        for draw_cmd in self.draw_commands:
-            h = draw_cmd.get_hash_key()
-            hash_count[h] = hash_count.get(h, 0) + 1
+        hash_count = Counter(map(DrawCommand.get_hash_key, self.draw_commands))
+
+        # defs 区域（包含所有 clipPath）位于路径之前，只需 bounding box，
+        # 先单独生成，路径本身随后逐个写出
+        clip_paths = []
+        for i, draw_cmd in enumerate(self.draw_commands):
+            if draw_cmd.bounding_box and self._has_path_data(draw_cmd):
+                bx, by, bw, bh = draw_cmd.bounding_box
+                # 为每个路径创建 clipPath，裁剪到其 bounding box
+                clip_paths.append(
+                    f'<clipPath id="clip_{i}"><rect x="{bx}" y="{by}" width="{bw}" height="{bh}"/></clipPath>'
+                )
+        defs_content = ""
+        if clip_paths:
+            defs_content = f'<defs>\n    {chr(10).join("    " + cp for cp in clip_paths)}\n  </defs>'
 
+        if xml_declaration:
+            write(_XML_DECLARATION)
+        write(
+            f"""<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" viewBox="0 0 {self.width} {self.height}">
+  {defs_content}
+  <rect width="100%" height="100%" fill="{self.background_color}"/>
+  <g id="paths">
+    """
+        )
+
+        rgba_list = self._colors_to_rgba(self.draw_commands)
+        sep = ""
         for i, draw_cmd in enumerate(self.draw_commands):
             d = self._path_to_svg(draw_cmd)
             if not d:
                 continue
 
-            r, g, b, a = self._color_to_rgba(draw_cmd.color)
+            r, g, b, a = rgba_list[i]
             fill_color = f"rgb({r},{g},{b})"
             opacity = a * draw_cmd.opacity
 
             transform = self._matrix_to_svg(draw_cmd.matrix)
 
             # 生成 hash 用于标识
-            path_hash = draw_cmd.get_hash_key()[:8]  # 只取前8位
+            hash_key = draw_cmd.get_hash_key()
+            path_hash = hash_key[:8]  # 只取前8位
 
             # 添加 split-count 属性用于显示 VGLite SPLIT 策略信息
-            split_count = hash_count.get(draw_cmd.get_hash_key(), 1)
+            split_count = hash_count.get(hash_key, 1)
             split_attr = f'data-split-count="{split_count}"' if split_count > 1 else ""
 
-            # 添加 bounding box 属性和 clipPath
+            # 添加 bounding box 属性和 clipPath 引用
             bbox_attr = ""
             clip_attr = ""
             if draw_cmd.bounding_box:
                 bx, by, bw, bh = draw_cmd.bounding_box
                 bbox_attr = f'data-bbox-x="{bx}" data-bbox-y="{by}" data-bbox-w="{bw}" data-bbox-h="{bh}"'
-                # 为每个路径创建 clipPath，裁剪到其 bounding box
-                clip_id = f"clip_{i}"
-                clip_paths.append(
-                    f'<clipPath id="{clip_id}"><rect x="{bx}" y="{by}" width="{bw}" height="{bh}"/></clipPath>'
-                )
-                clip_attr = f'clip-path="url(#{clip_id})"'
+                clip_attr = f'clip-path="url(#clip_{i})"'
 
             # 使用 <g> 元素包裹，clip-path 应用到 <g> 上，transform 应用到 path 上
             # 这样 clip-path 在屏幕坐标系中裁剪变换后的路径
@@ -406,24 +641,12 @@ class SVGExporter:
             else:
                 # 无 transform 或无 clip-path：直接在 path 上应用
                 path_elem = f'<path d="{d}" fill="{fill_color}" fill-opacity="{opacity:.2f}" fill-rule="{draw_cmd.fill_rule}" {transform} {clip_attr} data-index="{i}" data-hash="{path_hash}" {split_attr} {bbox_attr}/>'
-            paths.append(path_elem)
+            write(f"{sep}    {path_elem}")
+            sep = "\n"
 
-        # 生成 defs 区域（包含所有 clipPath）
-        defs_content = ""
-        if clip_paths:
-            defs_content = f'<defs>\n    {chr(10).join("    " + cp for cp in clip_paths)}\n  </defs>'
+        write('\n  </g>\n  <g id="highlightGroup"></g>\n  ')
 
-        # 生成 bounding box 矩形组 (每个路径一个，初始隐藏)
-        bbox_rects = []
-        for i, draw_cmd in enumerate(self.draw_commands):
-            if draw_cmd.bounding_box:
-                bx, by, bw, bh = draw_cmd.bounding_box
-                bbox_rects.append(
-                    f'<rect class="bbox-rect" data-path-index="{i}" x="{bx}" y="{by}" width="{bw}" height="{bh}" fill="none" stroke="#ff00ff" stroke-width="1" stroke-dasharray="3,3" style="display: none;"/>'
-                )
-        bbox_group = (
-            f'<g id="bboxGroup">{chr(10).join(bbox_rects)}</g>' if bbox_rects else ""
-        )
+        # bounding box 矩形不再逐个输出，由页面脚本在选中路径时按 data-bbox-* 创建
 
         # 生成 scissor 矩形
         scissor_rect = ""
@@ -434,25 +657,18 @@ class SVGExporter:
             if sw > 0 and sh > 0:
                 scissor_rect = f'<rect id="scissorRect" x="{sx}" y="{sy}" width="{sw}" height="{sh}" fill="none" stroke="#00ff00" stroke-width="2" stroke-dasharray="5,5" style="display: none;"/>'
 
-        svg = f"""<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" width="{self.width}" height="{self.height}" viewBox="0 0 {self.width} {self.height}">
-  {defs_content}
-  <rect width="100%" height="100%" fill="{self.background_color}"/>
-  <g id="paths">
-    {chr(10).join("    " + p for p in paths)}
-  </g>
-  <g id="highlightGroup"></g>
-  {bbox_group}
-  {scissor_rect}
-</svg>"""
-        return svg
+        write(f"\n  {scissor_rect}\n</svg>")
 
     def _wrap_in_html(self, svg_content: str) -> str:
         """将 SVG 包装为交互式 HTML"""
         # 移除 XML 声明
-        svg_content = svg_content.replace(
-            '<?xml version="1.0" encoding="UTF-8"?>\n', ""
-        )
+        svg_content = svg_content.replace(_XML_DECLARATION, "")
+        buf = io.StringIO()
+        self._write_html(buf, svg_content)
+        return buf.getvalue()
+
+    def _write_html(self, f: TextIO, svg_content: Optional[str] = None):
+        """将交互式 HTML 写入文本流，svg_content 为 None 时直接写入本导出器的 SVG"""
 
         # 生成 target buffer 信息 HTML
         target_info_html = ""
@@ -554,430 +770,25 @@ class SVGExporter:
             &nbsp;&nbsp;• color_transform (颜色变换): {self.context_state.color_transform}<br>
             &nbsp;&nbsp;• path_counter (路径计数): {self.context_state.path_counter}<br>"""
 
-        html_template = f"""<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>VGLite Visualization</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background: #f5f5f5;
-        }}
-        .container {{
-            max-width: 2000px;
-            margin: 0 auto;
-        }}
-        h1 {{
-            color: #333;
-            margin-bottom: 20px;
-        }}
-        .canvas-row {{
-            display: flex;
-            gap: 20px;
-            flex-wrap: wrap;
-            align-items: flex-start;
-        }}
-        .canvas-panel {{
-            background: white;
-            border: 1px solid #ddd;
-            border-radius: 8px;
-            padding: 20px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .canvas-panel h3 {{
-            margin: 0 0 15px 0;
-            color: #555;
-            font-size: 14px;
-            border-bottom: 1px solid #eee;
-            padding-bottom: 10px;
-        }}
-        .svg-container {{
-            display: inline-block;
-            overflow: visible;
-        }}
-        .image-container {{
-            display: inline-block;
-        }}
-        .controls {{
-            margin-bottom: 20px;
-        }}
-        .controls label {{
-            margin-right: 20px;
-        }}
-        .info {{
-            margin-top: 20px;
-            padding: 15px;
-            background: #e8f4fc;
-            border-radius: 4px;
-        }}
-        .path-data {{
-            max-height: 300px;
-            overflow-y: auto;
-            background: #f0f0f0;
-            padding: 10px;
-            border-radius: 4px;
-            margin-top: 10px;
-            font-family: monospace;
-            font-size: 12px;
-            word-break: break-all;
-            white-space: pre-wrap;
-        }}
-        svg {{
-            display: block;
-        }}
-        svg path {{
-            cursor: pointer;
-        }}
-        #highlightGroup path {{
-            pointer-events: none;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>VGLite GPU 渲染可视化</h1>
-        <div class="controls">
-            <label>
-                <input type="checkbox" id="showGrid" onchange="toggleGrid()"> 显示网格
-            </label>
-            <label>
-                <input type="checkbox" id="showCrosshair" onchange="toggleCrosshair()"> 显示光标
-            </label>
-            <label>
-                <input type="checkbox" id="showScissor" onchange="toggleScissor()"> 显示裁剪区域
-            </label>
-            <label>
-                <input type="checkbox" id="showBbox" onchange="toggleBbox()"> 显示路径边界
-            </label>
-            <label>
-                背景色: <input type="color" id="bgColor" value="#000000" oninput="updateBgColor()">
-            </label>
-            <label>
-                渲染进度: <input type="range" id="drawOrder" min="0" max="{len(self.draw_commands)}" step="1" value="{len(self.draw_commands)}" oninput="updateDrawOrder()" style="width: 120px;">
-                <span id="drawOrderValue">{len(self.draw_commands)}/{len(self.draw_commands)}</span>
-            </label>
-        </div>
-        <div class="canvas-row">
-            <div class="canvas-panel">
-                <h3>渲染命令重放</h3>
-                <div class="svg-container" id="svgContainer">
-                    {svg_content}
-                </div>
-            </div>
-            {target_buffer_image_html}
-        </div>
-        <div class="info">
-            <strong>统计信息:</strong> 共 {len(self.draw_commands)} 个绘制命令<br>
-            <strong>画布尺寸:</strong> {self.width} x {self.height}<br>{target_info_html}{context_state_html}
-            <strong>鼠标位置:</strong> <span id="mousePos">X: -, Y: -</span><br>
-            <span id="pathInfo"></span>
-        </div>
-    </div>
-    <script>
-        function toggleGrid() {{
-            const svg = document.querySelector('svg');
-            const showGrid = document.getElementById('showGrid').checked;
-            let grid = document.getElementById('gridPattern');
-            
-            if (showGrid && !grid) {{
-                const defs = document.createElementNS('http://www.w3.org/2000/svg', 'defs');
-                defs.innerHTML = `
-                    <pattern id="gridPattern" width="20" height="20" patternUnits="userSpaceOnUse">
-                        <path d="M 20 0 L 0 0 0 20" fill="none" stroke="#ddd" stroke-width="0.5"/>
-                    </pattern>
-                `;
-                svg.insertBefore(defs, svg.firstChild);
-                
-                const gridRect = document.createElementNS('http://www.w3.org/2000/svg', 'rect');
-                gridRect.setAttribute('id', 'gridRect');
-                gridRect.setAttribute('width', '100%');
-                gridRect.setAttribute('height', '100%');
-                gridRect.setAttribute('fill', 'url(#gridPattern)');
-                const bgRect = svg.querySelector('rect');
-                bgRect.parentNode.insertBefore(gridRect, bgRect.nextSibling);
-            }} else if (!showGrid) {{
-                const gridRect = document.getElementById('gridRect');
-                if (gridRect) gridRect.remove();
-                const defs = svg.querySelector('defs');
-                if (defs) defs.remove();
-            }}
-        }}
-        
-        function updateBgColor() {{
-            const color = document.getElementById('bgColor').value;
-            const bgRect = document.querySelector('svg > rect');
-            if (bgRect) bgRect.setAttribute('fill', color);
-        }}
-        
-        // 渲染进度控制
-        function updateDrawOrder() {{
-            const value = parseInt(document.getElementById('drawOrder').value);
-            const total = {len(self.draw_commands)};
-            document.getElementById('drawOrderValue').textContent = `${{value}}/${{total}}`;
-            
-            const paths = document.querySelectorAll('svg path');
-            paths.forEach((path, index) => {{
-                const pathIndex = parseInt(path.getAttribute('data-index'));
-                if (pathIndex < value) {{
-                    path.style.display = '';
-                }} else {{
-                    path.style.display = 'none';
-                }}
-            }});
-        }}
-        
-        // 光标功能
-        let crosshairEnabled = false;
-        let crosshairH = null;
-        let crosshairV = null;
-        
-        function toggleCrosshair() {{
-            crosshairEnabled = document.getElementById('showCrosshair').checked;
-            if (!crosshairEnabled) {{
-                if (crosshairH) {{ crosshairH.remove(); crosshairH = null; }}
-                if (crosshairV) {{ crosshairV.remove(); crosshairV = null; }}
-                // 同时隐藏目标缓冲区的光标
-                const targetH = document.getElementById('targetCrosshairH');
-                const targetV = document.getElementById('targetCrosshairV');
-                if (targetH) targetH.style.display = 'none';
-                if (targetV) targetV.style.display = 'none';
-            }}
-        }}
-        
-        function toggleScissor() {{
-            const showScissor = document.getElementById('showScissor').checked;
-            const scissorRect = document.getElementById('scissorRect');
-            if (scissorRect) {{
-                scissorRect.style.display = showScissor ? '' : 'none';
-            }}
-        }}
-        
-        // 当前选中的路径索引
-        var selectedPathIndex = -1;
-        
-        function toggleBbox() {{
-            updateSelectedBbox();
-        }}
-        
-        function updateSelectedBbox() {{
-            const showBbox = document.getElementById('showBbox').checked;
-            
-            // 先隐藏所有 bbox
-            document.querySelectorAll('.bbox-rect').forEach(rect => {{
-                rect.style.display = 'none';
-            }});
-            
-            if (!showBbox || selectedPathIndex < 0) {{
-                return;
-            }}
-            
-            // 显示选中路径的边界
-            const bboxRect = document.querySelector(`.bbox-rect[data-path-index="${{selectedPathIndex}}"]`);
-            if (bboxRect) {{
-                bboxRect.style.display = '';
-            }}
-        }}
-        
-        function updateCrosshair(x, y) {{
-            const svg = document.querySelector('svg');
-            if (!crosshairEnabled) return;
-            
-            if (!crosshairH) {{
-                crosshairH = document.createElementNS('http://www.w3.org/2000/svg', 'line');
-                crosshairH.setAttribute('stroke', '#00ff00');
-                crosshairH.setAttribute('stroke-width', '1');
-                crosshairH.setAttribute('stroke-dasharray', '4,4');
-                crosshairH.style.pointerEvents = 'none';
-                svg.appendChild(crosshairH);
-            }}
-            if (!crosshairV) {{
-                crosshairV = document.createElementNS('http://www.w3.org/2000/svg', 'line');
-                crosshairV.setAttribute('stroke', '#00ff00');
-                crosshairV.setAttribute('stroke-width', '1');
-                crosshairV.setAttribute('stroke-dasharray', '4,4');
-                crosshairV.style.pointerEvents = 'none';
-                svg.appendChild(crosshairV);
-            }}
-            
-            // 水平线
-            crosshairH.setAttribute('x1', '0');
-            crosshairH.setAttribute('y1', y);
-            crosshairH.setAttribute('x2', '{self.width}');
-            crosshairH.setAttribute('y2', y);
-            
-            // 垂直线
-            crosshairV.setAttribute('x1', x);
-            crosshairV.setAttribute('y1', '0');
-            crosshairV.setAttribute('x2', x);
-            crosshairV.setAttribute('y2', '{self.height}');
-            
-            // 同步更新目标缓冲区的光标
-            updateTargetCrosshair(x, y);
-        }}
-        
-        function updateTargetCrosshair(x, y) {{
-            const targetContainer = document.getElementById('targetBufferContainer');
-            const targetImg = document.getElementById('targetBufferImg');
-            const targetH = document.getElementById('targetCrosshairH');
-            const targetV = document.getElementById('targetCrosshairV');
-            
-            if (!targetContainer || !targetImg || !targetH || !targetV) return;
-            if (!crosshairEnabled) {{
-                targetH.style.display = 'none';
-                targetV.style.display = 'none';
-                return;
-            }}
-            
-            // 计算目标图像的缩放比例
-            const imgRect = targetImg.getBoundingClientRect();
-            const scaleX = imgRect.width / {self.width};
-            const scaleY = imgRect.height / {self.height};
-            
-            // 计算目标图像上的光标位置
-            const targetX = x * scaleX;
-            const targetY = y * scaleY;
-            
-            targetH.style.display = '';
-            targetH.style.top = targetY + 'px';
-            
-            targetV.style.display = '';
-            targetV.style.left = targetX + 'px';
-        }}
-        
-        function hideTargetCrosshair() {{
-            const targetH = document.getElementById('targetCrosshairH');
-            const targetV = document.getElementById('targetCrosshairV');
-            if (targetH) targetH.style.display = 'none';
-            if (targetV) targetV.style.display = 'none';
-        }}
-        
-        // 鼠标位置追踪
-        const svg = document.querySelector('svg');
-        svg.addEventListener('mousemove', function(e) {{
-            const rect = svg.getBoundingClientRect();
-            // 计算相对于 SVG 画布的坐标
-            const x = e.clientX - rect.left;
-            const y = e.clientY - rect.top;
-            document.getElementById('mousePos').textContent = `X: ${{Math.round(x)}}, Y: ${{Math.round(y)}}`;
-            updateCrosshair(x, y);
-        }});
-        
-        svg.addEventListener('mouseleave', function() {{
-            document.getElementById('mousePos').textContent = 'X: -, Y: -';
-            if (crosshairH) {{ crosshairH.remove(); crosshairH = null; }}
-            if (crosshairV) {{ crosshairV.remove(); crosshairV = null; }}
-            hideTargetCrosshair();
-        }});
-        
-        // 高亮显示函数
-        function highlightPath(pathElement) {{
-            const highlightGroup = document.getElementById('highlightGroup');
-            // 清除之前的高亮
-            highlightGroup.innerHTML = '';
-            
-            if (!pathElement) return;
-            
-            // 复制路径并设置半透明高亮样式
-            const highlightPath = pathElement.cloneNode(true);
-            highlightPath.removeAttribute('data-index');
-            highlightPath.removeAttribute('data-hash');
-            highlightPath.removeAttribute('data-split-count');
-            highlightPath.removeAttribute('data-bbox-x');
-            highlightPath.removeAttribute('data-bbox-y');
-            highlightPath.removeAttribute('data-bbox-w');
-            highlightPath.removeAttribute('data-bbox-h');
-            highlightPath.setAttribute('fill', '#00ff00');
-            highlightPath.setAttribute('fill-opacity', '0.4');
-            highlightPath.style.pointerEvents = 'none';
-            
-            // 如果路径在 <g> 中，需要保持 clip-path
-            const parentG = pathElement.parentElement;
-            if (parentG && parentG.tagName === 'g' && parentG.getAttribute('clip-path')) {{
-                const highlightG = document.createElementNS('http://www.w3.org/2000/svg', 'g');
-                highlightG.setAttribute('clip-path', parentG.getAttribute('clip-path'));
-                highlightG.appendChild(highlightPath);
-                highlightGroup.appendChild(highlightG);
-            }} else {{
-                highlightGroup.appendChild(highlightPath);
-            }}
-        }}
-        
-        // 路径点击事件
-        document.querySelectorAll('svg path').forEach(path => {{
-            path.addEventListener('click', function() {{
-                // 高亮选中的路径
-                highlightPath(this);
-                
-                const index = this.getAttribute('data-index');
-                selectedPathIndex = parseInt(index);
-                
-                // 更新选中路径的 bbox 显示
-                updateSelectedBbox();
-                
-                const d = this.getAttribute('d');
-                const fill = this.getAttribute('fill');
-                const fillOpacity = this.getAttribute('fill-opacity');
-                const fillRule = this.getAttribute('fill-rule');
-                const transform = this.getAttribute('transform') || '无';
-                const splitCount = this.getAttribute('data-split-count');
-                const bboxX = this.getAttribute('data-bbox-x');
-                const bboxY = this.getAttribute('data-bbox-y');
-                const bboxW = this.getAttribute('data-bbox-w');
-                const bboxH = this.getAttribute('data-bbox-h');
-                
-                // 将SVG路径格式转换为 MOVE,x,y 格式
-                function formatPath(svgPath) {{
-                    return svgPath
-                        .replace(/M\\s*([\\d.-]+)\\s+([\\d.-]+)/g, 'MOVE,$1,$2,')
-                        .replace(/L\\s*([\\d.-]+)\\s+([\\d.-]+)/g, 'LINE,$1,$2,')
-                        .replace(/Q\\s*([\\d.-]+)\\s+([\\d.-]+)\\s+([\\d.-]+)\\s+([\\d.-]+)/g, 'QUAD,$1,$2,$3,$4,')
-                        .replace(/C\\s*([\\d.-]+)\\s+([\\d.-]+)\\s+([\\d.-]+)\\s+([\\d.-]+)\\s+([\\d.-]+)\\s+([\\d.-]+)/g, 'CUBIC,$1,$2,$3,$4,$5,$6,')
-                        .replace(/Z/g, 'CLOSE,')
-                        .replace(/,\\s*/g, ',')
-                        .split(/(MOVE|LINE|QUAD|CUBIC|CLOSE),/)
-                        .filter(s => s.trim())
-                        .reduce((acc, curr, i, arr) => {{
-                            if (['MOVE', 'LINE', 'QUAD', 'CUBIC', 'CLOSE'].includes(curr)) {{
-                                acc.push(curr + ',' + (arr[i+1] || ''));
-                            }}
-                            return acc;
-                        }}, [])
-                        .join('\\n') + '\\nEND,';
-                }}
-                
-                const formattedD = formatPath(d);
-                
-                // 生成 split 信息（如果存在）
-                let splitInfo = '';
-                if (splitCount && parseInt(splitCount) > 1) {{
-                    splitInfo = `<span style="color: #ff9800; font-weight: bold;">⚠ VGLite SPLIT x${{splitCount}}</span><br>`;
-                }}
-                
-                // 生成 bounding box 信息
-                let bboxInfo = '';
-                if (bboxX && bboxY && bboxW && bboxH) {{
-                    bboxInfo = `路径边界: (${{bboxX}}, ${{bboxY}}) - ${{bboxW}}x${{bboxH}}<br>`;
-                }}
-                
-                document.getElementById('pathInfo').innerHTML = 
-                    `<br><strong>选中路径 #${{index}}:</strong><br>` +
-                    splitInfo +
-                    `颜色: ${{fill}} (透明度: ${{fillOpacity}})<br>` +
-                    `填充规则: ${{fillRule}}<br>` +
-                    bboxInfo +
-                    `变换矩阵: <code>${{transform}}</code><br>` +
-                    `路径长度: ${{d.length}} 字符<br>` +
-                    `<div class="path-data">${{formattedD}}</div>`;
-            }});
-        }});
-    </script>
-</body>
-</html>"""
-        return html_template
+        # 静态部分在模块加载时已切分好，这里只按顺序写入各段和字段值
+        fields = {
+            "total": str(len(self.draw_commands)),
+            "target_buffer_image_html": target_buffer_image_html,
+            "target_info_html": target_info_html,
+            "context_state_html": context_state_html,
+            "width": str(self.width),
+            "height": str(self.height),
+        }
+        write = f.write
+        for i, part in enumerate(HTML_PARTS):
+            if not i % 2:
+                write(part)
+            elif part != "svg_content":
+                write(fields[part])
+            elif svg_content is None:
+                self._write_svg(f, xml_declaration=False)
+            else:
+                write(svg_content)
 
 
 def export_commands_to_svg(